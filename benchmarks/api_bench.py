@@ -0,0 +1,244 @@
+"""In-process load test for the API (signup, login, create, list, filters, delete).
+
+    python -m benchmarks.api_bench --dataset 1k --concurrency 20 --requests 500 \
+        --output bench_results.json [--baseline old_results.json --threshold 0.2]
+
+`src.main:app` is driven through httpx's ASGI transport against a temporary
+SQLite file, so no server or network is involved. The database is seeded
+with `--dataset` contacts (1k / 100k / 1m, or a plain number) owned by the
+benchmark account before the timed scenarios run.
+
+Per scenario the report has throughput, error count and p50/p95/p99
+latency. With `--baseline`, the run fails (exit code 1) if any scenario's
+throughput drops, or its p95 grows, by more than `--threshold`.
+
+Run from the repository root (templates are resolved relative to it).
+Needs httpx (`pip install httpx`), which the app itself does not depend on.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from typing import Callable, Dict, List, Optional
+
+DATASETS = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+SCENARIOS = ("signup", "login", "create", "list_html", "list_json", "filter_above", "filter_between", "delete")
+SEED_CHUNK = 10_000
+FIRST_FREE_ID = 10_000_000
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _seed_contacts(owner_id: int, count: int) -> None:
+    from sqlalchemy import insert
+    from src.core.db_global import get_db
+    from src.database.owner_version_repository import OwnerVersionRepository
+    from src.models.contact import Contact
+
+    session = get_db().get_session()
+    try:
+        today = date.today()
+        for start in range(1, count + 1, SEED_CHUNK):
+            rows = [
+                {"id": i, "name": f"contact {i}", "email": f"contact{i}@bench.local",
+                 "date_of_birth": date(1950 + i % 60, 1 + i % 12, 1 + i % 28),
+                 "is_active": True, "created_at": today, "owner_id": owner_id}
+                for i in range(start, min(start + SEED_CHUNK, count + 1))
+            ]
+            session.execute(insert(Contact), rows)
+            session.commit()
+        OwnerVersionRepository(session).bump(owner_id)
+        session.commit()
+    finally:
+        session.close()
+
+
+class Scenario:
+    def __init__(self, name: str, make_request: Callable, ok_status: tuple) -> None:
+        self.name = name
+        self.make_request = make_request
+        self.ok_status = ok_status
+
+
+def _scenarios(seeded: int) -> Dict[str, Scenario]:
+    counter = itertools.count(FIRST_FREE_ID)
+    created: List[int] = []
+
+    def signup(client):
+        n = next(counter)
+        return client.post("/api/account/signup", data={"username": f"bench{n}", "email": f"bench{n}@x", "password": "pw"})
+
+    def login(client):
+        return client.post("/api/account/login", data={"username": "bench", "password": "bench-password"})
+
+    def create(client):
+        n = next(counter)
+        created.append(n)
+        return client.post("/api/contacts/create", data={
+            "name": f"new {n}", "email": f"new{n}@bench.local", "id_1": n, "date_of_birth": "1990-05-05"})
+
+    def list_html(client):
+        return client.get("/pages/contacts/all")
+
+    def list_json(client):
+        return client.get("/api/contacts/all", params={"limit": 100, "after_id": seeded // 2})
+
+    def filter_above(client):
+        return client.post("/api/filters/age/above", data={"age": 70})
+
+    def filter_between(client):
+        return client.post("/api/filters/age/between", data={"min_age": 30, "max_age": 32})
+
+    def delete(client):
+        contact_id = created.pop() if created else next(counter)
+        return client.post("/api/contacts/delete", data={"id_1": contact_id})
+
+    return {
+        "signup": Scenario("signup", signup, (201,)),
+        "login": Scenario("login", login, (303,)),
+        "create": Scenario("create", create, (201,)),
+        "list_html": Scenario("list_html", list_html, (200,)),
+        "list_json": Scenario("list_json", list_json, (200,)),
+        "filter_above": Scenario("filter_above", filter_above, (200,)),
+        "filter_between": Scenario("filter_between", filter_between, (200,)),
+        "delete": Scenario("delete", delete, (200, 404)),
+    }
+
+
+async def _run_scenario(client, scenario: Scenario, requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    remaining = itertools.count()
+
+    async def worker() -> None:
+        nonlocal errors
+        while next(remaining) < requests:
+            start = time.perf_counter()
+            response = await scenario.make_request(client)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code not in scenario.ok_status:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+async def run(dataset: int, requests: int, concurrency: int, names: List[str]) -> dict:
+    import httpx
+    from src.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            await client.post("/api/account/signup", data={"username": "bench", "email": "bench@x", "password": "bench-password"})
+            response = await client.post("/api/account/login", data={"username": "bench", "password": "bench-password"})
+            if response.status_code != 303:
+                raise RuntimeError(f"benchmark login failed: {response.status_code}")
+
+            from src.core.db_global import get_db
+            from src.database.account_repository import AccountsRepository
+            session = get_db().get_session()
+            owner_id = AccountsRepository(session).get_by_username("bench").id
+            session.close()
+
+            seed_start = time.perf_counter()
+            _seed_contacts(owner_id, dataset)
+            print(f"seeded {dataset} contacts in {time.perf_counter() - seed_start:.1f}s", file=sys.stderr)
+
+            scenarios = _scenarios(dataset)
+            for name in names:
+                results[name] = await _run_scenario(client, scenarios[name], requests, concurrency)
+                r = results[name]
+                print(f"{name:<15} {r['throughput_rps']:>9.1f} req/s  p50 {r['p50_ms']:>8.2f}ms  "
+                      f"p95 {r['p95_ms']:>8.2f}ms  p99 {r['p99_ms']:>8.2f}ms  errors {r['errors']}",
+                      file=sys.stderr)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    regressions = []
+    for name, current in results.items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        if old["throughput_rps"] and current["throughput_rps"] < old["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {current['throughput_rps']:.1f} < baseline {old['throughput_rps']:.1f}")
+        if old["p95_ms"] and current["p95_ms"] > old["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {current['p95_ms']:.2f}ms > baseline {old['p95_ms']:.2f}ms")
+    return regressions
+
+
+def _dataset_size(value: str) -> int:
+    return DATASETS.get(value.lower()) or int(value)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", type=_dataset_size, default=DATASETS["1k"], help="1k, 100k, 1m or a number")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma separated subset")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        ## must be set before src.main (and with it the DBCore singleton) is imported
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+        os.environ.setdefault("LOG_SAMPLE_RATE", "0")
+        os.environ.setdefault("LOGIN_RATE_LIMIT", "off")  # the login scenario hammers one username
+        results = asyncio.run(run(args.dataset, args.requests, args.concurrency, names))
+
+    report = {
+        "dataset": args.dataset,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "db_mode": os.getenv("DB_MODE", "sync"),
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Cold-start profile: how long `import src.main` takes, and where the time goes.
+
+    python -m benchmarks.import_bench --budget-ms 2000 --top 15
+
+Runs `python -X importtime -c "import src.main"` in fresh interpreters
+against a scratch SQLite file, prints the slowest modules by cumulative
+import time, and exits with status 1 when the median exceeds the budget.
+It also fails if the import touched the database, since engine creation and
+schema checks belong in the app lifespan.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def _profile_once(db_path: str) -> Tuple[int, Dict[str, Tuple[int, int]]]:
+    """One cold import; returns (total µs, {module: (self µs, cumulative µs)})."""
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    modules: Dict[str, Tuple[int, int]] = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = (int(self_us), int(cumulative_us))
+        if len(indent) == 1:  # top-level import
+            total += int(cumulative_us)
+    return total, modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "2000")))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "import.db")
+        runs: List[Tuple[int, Dict[str, Tuple[int, int]]]] = [_profile_once(db_path) for _ in range(args.runs)]
+        touched_db = os.path.exists(db_path)
+
+    totals_ms = [total / 1000 for total, _ in runs]
+    median_ms = statistics.median(totals_ms)
+    _, modules = min(runs, key=lambda run: abs(run[0] / 1000 - median_ms))
+
+    print(f"{'module':<50} {'self ms':>9} {'cumul ms':>9}")
+    slowest = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{name:<50} {self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}")
+    own = sorted(
+        ((name, self_us) for name, (self_us, _) in modules.items() if name.split(".")[0] == "src"),
+        key=lambda item: item[1], reverse=True,
+    )
+    print(f"\nsrc.* self time: {sum(us for _, us in own) / 1000:.1f} ms "
+          f"(slowest: {', '.join(f'{n} {us / 1000:.1f}' for n, us in own[:3])})")
+    print(f"import src.main: median {median_ms:.0f} ms, min {min(totals_ms):.0f} ms over {args.runs} runs "
+          f"(budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if touched_db:
+        print("FAIL: importing src.main created the database; move the work into the lifespan")
+        failed = True
+    if median_ms > args.budget_ms:
+        print("FAIL: import time is over budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
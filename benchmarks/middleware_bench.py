@@ -0,0 +1,90 @@
+"""Throughput of a trivial route behind the old BaseHTTPMiddleware timing vs. TimingMiddleware.
+
+    python -m benchmarks.middleware_bench --requests 20000
+
+Requests are driven straight through the ASGI interface (no HTTP client or
+socket), so the numbers isolate the per-request cost of the middleware.
+Access logging is silenced for both variants.
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import RequestResponseEndpoint
+from starlette.responses import PlainTextResponse, Response
+
+from src.core.timing_middleware import TimingMiddleware
+
+
+def _base_http_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> PlainTextResponse:
+        return PlainTextResponse("pong")
+
+    @app.middleware("http")
+    async def log_request_time(request: Request, call_next: RequestResponseEndpoint) -> Response:
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        formatted_time = f"{process_time:.4f} sec"
+        logging.getLogger("bench").info("%s %s took %s", request.method, request.url.path, formatted_time)
+        response.headers["X-Process-Time"] = formatted_time
+        return response
+
+    return app
+
+
+def _pure_asgi_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> PlainTextResponse:
+        return PlainTextResponse("pong")
+
+    app.add_middleware(TimingMiddleware, sample_rate=0.0)
+    return app
+
+
+async def _drive(app, requests: int, concurrency: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/ping", "raw_path": b"/ping", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(_message):
+        pass
+
+    async def worker(n: int) -> None:
+        for _ in range(n):
+            await app(dict(scope), receive, send)
+
+    per_worker = requests // concurrency
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+    return per_worker * concurrency / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    for name, factory in (("BaseHTTPMiddleware", _base_http_app), ("TimingMiddleware", _pure_asgi_app)):
+        app = factory()
+        asyncio.run(_drive(app, 1000, args.concurrency))  # warm up
+        rps = asyncio.run(_drive(app, args.requests, args.concurrency))
+        print(f"{name:<20} {rps:>10.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Concurrent read/write throughput of the default vs. performance SQLite profile.
+
+    python -m benchmarks.sqlite_profile_bench --readers 4 --writers 2 --seconds 5
+
+Each run uses a fresh temporary database seeded with `--rows` contacts, then
+runs reader threads (owner-scoped keyset pages) and writer threads (single
+contact inserts, one commit each) against the same engine for `--seconds`.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import date
+
+from sqlalchemy import insert, select
+from sqlmodel import SQLModel, create_engine
+
+from src.database.db_config import DBConfig
+from src.models.contact import Contact
+
+
+def _build_engine(path: str, profile: str):
+    os.environ["SQLITE_PROFILE"] = profile
+    config = DBConfig(f"sqlite:///{path}")
+    kwargs = config.engine_kwargs()
+    kwargs["pool_size"] = kwargs["max_overflow"] = 32
+    engine = create_engine(config.url, **kwargs)
+    config.install_pragmas(engine)
+    return engine
+
+
+def _seed(engine, rows: int) -> None:
+    SQLModel.metadata.create_all(engine)
+    today = date.today()
+    with engine.begin() as conn:
+        conn.execute(insert(Contact), [
+            {"id": i, "name": f"n{i}", "email": f"seed{i}@example.com", "date_of_birth": date(1990, 1, 1),
+             "is_active": True, "created_at": today, "owner_id": i % 10}
+            for i in range(1, rows + 1)
+        ])
+
+
+def run_profile(profile: str, readers: int, writers: int, seconds: float, rows: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = _build_engine(os.path.join(tmp, "bench.db"), profile)
+        _seed(engine, rows)
+
+        stop = threading.Event()
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        next_id = [rows + 1]
+
+        def reader(owner: int) -> None:
+            stmt = select(Contact.id, Contact.name).where(Contact.owner_id == owner).order_by(Contact.id).limit(100)
+            done = 0
+            while not stop.is_set():
+                with engine.connect() as conn:
+                    conn.execute(stmt).all()
+                done += 1
+            with lock:
+                counts["reads"] += done
+
+        def writer() -> None:
+            done = errors = 0
+            while not stop.is_set():
+                with lock:
+                    cid = next_id[0]
+                    next_id[0] += 1
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(insert(Contact).values(
+                            id=cid, name="w", email=f"w{cid}@example.com", date_of_birth=date(1990, 1, 1),
+                            is_active=True, created_at=date.today(), owner_id=cid % 10,
+                        ))
+                    done += 1
+                except Exception:
+                    errors += 1
+            with lock:
+                counts["writes"] += done
+                counts["errors"] += errors
+
+        threads = [threading.Thread(target=reader, args=(i % 10,)) for i in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        engine.dispose()
+
+    return {
+        "profile": profile,
+        "reads_per_sec": counts["reads"] / seconds,
+        "writes_per_sec": counts["writes"] / seconds,
+        "write_errors": counts["errors"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    results = [run_profile(p, args.readers, args.writers, args.seconds, args.rows) for p in ("default", "performance")]
+    print(f"{'profile':<12} {'reads/s':>10} {'writes/s':>10} {'write errors':>13}")
+    for r in results:
+        print(f"{r['profile']:<12} {r['reads_per_sec']:>10.0f} {r['writes_per_sec']:>10.0f} {r['write_errors']:>13}")
+
+
+if __name__ == "__main__":
+    main()
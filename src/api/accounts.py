@@ -1,60 +1,53 @@
 import os
+from typing import Optional
 
-from fastapi import APIRouter, Depends, Form, Request, status
+from fastapi import APIRouter, Form, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse, RedirectResponse
-from sqlmodel import Session
 from starlette.responses import Response
 
-from src.core.api_globals import templates, security
-from src.core.db_global import get_session
+from src.core.api_globals import login_limiter, page_cache, templates, security
+from src.core.db_global import get_db
 
 from src.database.account_repository import AccountsRepository
+from src.models.account import Account
 
 accounts_router = APIRouter()
-####################################################################### Home / Menu
-@accounts_router.get("/", name="show_homepage")
-def show_homepage(request: Request) -> Response:
-    return templates.TemplateResponse(
-        "auth/homepage.html",
-        {"request": request}
-    )
 
-@accounts_router.get("/menu", name="menu_after_login")
-def menu_after_login(request: Request) -> Response:
-    return templates.TemplateResponse(
-        "menu.html",
-        {"request": request}
-    )
+SIGNUP_CONFLICT_ERRORS = {
+    "username": "Account with this Username already exists!",
+    "email": "Account with this Email already exists!",
+}
+DEFAULT_SIGNUP_CONFLICT_ERROR = "Account with this ID or Email already exists!"
+
+## Signup and login are async so a request waiting on the Argon2 pool holds no
+## threadpool thread; their short DB steps run in the threadpool, each in its
+## own session, so no pooled connection is held across the hash either.
+def _find_signup_conflict(username: str, email_norm: str) -> Optional[str]:
+    with get_db().get_read_session() as session:
+        return AccountsRepository(session).find_conflict(username, email_norm)
+
+def _insert_account(username: str, email_norm: str, hashed_password: str) -> Optional[str]:
+    with get_db().get_session() as session:
+        conflict = AccountsRepository(session).insert_account(
+            username=username, email=email_norm, hashed_password=hashed_password,
+        )
+        session.commit()
+    return conflict
 
-####################################################################### Signup Endpoints
-@accounts_router.get("/pages/account/signup", name="account_create_page")
-def account_create_page(request: Request) -> Response:
-    return templates.TemplateResponse(
-        "auth/signup/signup.html",
-        {"request": request},
-        status_code=status.HTTP_200_OK,
-    )
+def _get_account(username: str) -> Optional[Account]:
+    with get_db().get_read_session() as session:
+        return AccountsRepository(session).get_by_username(username)
 
-@accounts_router.post("/api/account/signup", name="api_signup_create")
-def signup_account_results(
-        request: Request,
-        username: str = Form(...),
-        email: str = Form(...),
-        password: str = Form(...),
-        session: Session = Depends(get_session)
-) -> Response:
-    error = "Account with this ID or Email already exists!"
-    status_code = status.HTTP_400_BAD_REQUEST
+async def check_login_rate(username: str, client_ip: Optional[str]) -> None:
+    if login_limiter.blocking:
+        await run_in_threadpool(login_limiter.check, username, client_ip)
+    else:
+        login_limiter.check(username, client_ip)
 
-    account_repo = AccountsRepository(session)
-    email_norm = email.strip().casefold()
-    user_norm = username.strip().casefold()
-    hashed = security.get_password_hash(password)
-
-    if not account_repo.check_mail_and_username(email_norm, user_norm):  # if not exists
-        account_repo.create_account(username=user_norm, email=email_norm, hashed_password=hashed)
-        error = None
-        status_code = status.HTTP_201_CREATED
+def signup_result(request: Request, conflict: Optional[str], user_norm: str, email_norm: str) -> Response:
+    error = SIGNUP_CONFLICT_ERRORS.get(conflict, DEFAULT_SIGNUP_CONFLICT_ERROR) if conflict else None
+    status_code = status.HTTP_400_BAD_REQUEST if conflict else status.HTTP_201_CREATED
 
     return templates.TemplateResponse(
         "auth/signup/signup_result.html",
@@ -67,27 +60,9 @@ def signup_account_results(
         status_code=status_code,
     )
 
-####################################################################### Login / Logout Endpoints
-@accounts_router.get("/pages/account/login", name="account_login_page")
-def account_login_page(request: Request) -> Response:
-    return templates.TemplateResponse(
-        "auth/login/login.html",
-        {"request": request},
-        status_code=status.HTTP_200_OK,
-    )
-
-@accounts_router.post("/api/account/login", name="api_account_login")
-def login(
-    request: Request,
-    username: str = Form(...),
-    password: str = Form(...),
-    session: Session = Depends(get_session),
-):
-    user_norm = username.strip().casefold()
-    repo = AccountsRepository(session)
-    acc = repo.get_by_username(user_norm)
-
-    if not acc or not security.verify_password(password, acc.hashed_password) or not acc.is_active:
+def login_result(request: Request, acc: Optional[Account], user_norm: str) -> Response:
+    """Failure page, or the menu redirect carrying a fresh access token."""
+    if acc is None:
         return templates.TemplateResponse(
             "auth/login/login_fail.html",
             {"request": request, "username": user_norm}
@@ -106,6 +81,59 @@ def login(
         path="/",
     )
     return resp
+####################################################################### Home / Menu
+@accounts_router.get("/", name="show_homepage")
+def show_homepage(request: Request) -> Response:
+    return page_cache.render(request, "auth/homepage.html")
+
+@accounts_router.get("/menu", name="menu_after_login")
+def menu_after_login(request: Request) -> Response:
+    return page_cache.render(request, "menu.html")
+
+####################################################################### Signup Endpoints
+@accounts_router.get("/pages/account/signup", name="account_create_page")
+def account_create_page(request: Request) -> Response:
+    return page_cache.render(request, "auth/signup/signup.html")
+
+@accounts_router.post("/api/account/signup", name="api_signup_create")
+async def signup_account_results(
+        request: Request,
+        username: str = Form(...),
+        email: str = Form(...),
+        password: str = Form(...),
+) -> Response:
+    email_norm = email.strip().casefold()
+    user_norm = username.strip().casefold()
+
+    ## only pay for Argon2 when the insert can succeed; the insert itself still
+    ## guards against a concurrent signup taking the name in the meantime
+    conflict = await run_in_threadpool(_find_signup_conflict, user_norm, email_norm)
+    if conflict is None:
+        hashed = await security.get_password_hash_async(password)
+        conflict = await run_in_threadpool(_insert_account, user_norm, email_norm, hashed)
+
+    return signup_result(request, conflict, user_norm, email_norm)
+
+####################################################################### Login / Logout Endpoints
+@accounts_router.get("/pages/account/login", name="account_login_page")
+def account_login_page(request: Request) -> Response:
+    return page_cache.render(request, "auth/login/login.html")
+
+@accounts_router.post("/api/account/login", name="api_account_login")
+async def login(
+    request: Request,
+    username: str = Form(...),
+    password: str = Form(...),
+):
+    user_norm = username.strip().casefold()
+    ## throttle before the account lookup and the Argon2 verify, so floods
+    ## against any username (known or not) cost neither DB nor CPU time
+    await check_login_rate(user_norm, request.client.host if request.client else None)
+    acc = await run_in_threadpool(_get_account, user_norm)
+
+    if not acc or not await security.verify_password_async(password, acc.hashed_password) or not acc.is_active:
+        acc = None
+    return login_result(request, acc, user_norm)
 
 @accounts_router.get("/account/logout", name="logout_account")
 def logout_account(request: Request) -> Response:
@@ -0,0 +1,62 @@
+from typing import Optional
+
+from fastapi import APIRouter, Form, Request
+from starlette.responses import Response
+
+from src.api.accounts import check_login_rate, login_result, signup_result
+from src.core.api_globals import security
+from src.core.db_global import get_async_db
+from src.database.async_account_repository import AsyncAccountsRepository
+from src.models.account import Account
+
+## Mounted ahead of `accounts_router` when DB_MODE=async: signup and login run
+## on the AsyncEngine end to end. Each DB step uses its own short session, so
+## no connection is held while the Argon2 pool works.
+async_accounts_router = APIRouter()
+
+async def _find_signup_conflict(username: str, email_norm: str) -> Optional[str]:
+    async with get_async_db().get_read_session() as session:
+        return await AsyncAccountsRepository(session).find_conflict(username, email_norm)
+
+async def _insert_account(username: str, email_norm: str, hashed_password: str) -> Optional[str]:
+    async with get_async_db().get_session() as session:
+        conflict = await AsyncAccountsRepository(session).insert_account(
+            username=username, email=email_norm, hashed_password=hashed_password,
+        )
+        await session.commit()
+    return conflict
+
+async def _get_account(username: str) -> Optional[Account]:
+    async with get_async_db().get_read_session() as session:
+        return await AsyncAccountsRepository(session).get_by_username(username)
+
+@async_accounts_router.post("/api/account/signup", name="api_signup_create")
+async def signup_account_results(
+        request: Request,
+        username: str = Form(...),
+        email: str = Form(...),
+        password: str = Form(...),
+) -> Response:
+    email_norm = email.strip().casefold()
+    user_norm = username.strip().casefold()
+
+    conflict = await _find_signup_conflict(user_norm, email_norm)
+    if conflict is None:
+        hashed = await security.get_password_hash_async(password)
+        conflict = await _insert_account(user_norm, email_norm, hashed)
+
+    return signup_result(request, conflict, user_norm, email_norm)
+
+@async_accounts_router.post("/api/account/login", name="api_account_login")
+async def login(
+    request: Request,
+    username: str = Form(...),
+    password: str = Form(...),
+):
+    user_norm = username.strip().casefold()
+    await check_login_rate(user_norm, request.client.host if request.client else None)
+    acc = await _get_account(user_norm)
+
+    if not acc or not await security.verify_password_async(password, acc.hashed_password) or not acc.is_active:
+        acc = None
+    return login_result(request, acc, user_norm)
@@ -0,0 +1,181 @@
+import asyncio
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Form, Query, Request, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.responses import Response
+
+from src.api.contacts import (
+    CONFLICT_ERRORS, DEFAULT_CONFLICT_ERROR, MAX_PAGE_SIZE, STREAM_CHUNK_SIZE, WRITE_BEHIND_CONFLICTS,
+)
+from src.core import conditional, write_behind
+from src.core.api_globals import contact_writer, html_streamer, templates, security
+from src.core.json_response import FastJSONResponse
+from src.core.db_global import get_async_read_session, get_async_session
+from src.database.async_contact_repository import AsyncContactRepository
+from src.database.contact_repository import age_above_condition, age_between_condition
+from src.models.contact import Contact
+from src.models.account import Account
+
+## Mounted ahead of `contacts_router` when DB_MODE=async, so these handlers
+## shadow the sync ones on the same paths; everything else stays sync.
+## Each route resolves its account via `get_current_contact_async`; no sync
+## router-level dependency, so a request never hops to the threadpool.
+async_contacts_router = APIRouter()
+
+@async_contacts_router.post("/api/contacts/create", name="api_contacts_create")
+async def contacts_create(
+        request: Request,
+        name: str = Form(...),
+        email: str = Form(...),
+        id_1: int = Form(...),
+        date_of_birth: date = Form(...),
+        session: AsyncSession = Depends(get_async_session),
+        current_account: Account = Depends(security.get_current_contact_async)
+) -> Response:
+    email_norm = email.strip().casefold()
+
+    if contact_writer.enabled:
+        outcome = await asyncio.wrap_future(contact_writer.submit({
+            "id": id_1,
+            "name": name,
+            "email": email_norm,
+            "date_of_birth": date_of_birth,
+            "owner_id": current_account.id,
+        }))
+        conflict = None if outcome == write_behind.CREATED else WRITE_BEHIND_CONFLICTS.get(outcome, outcome)
+    else:
+        contact = Contact(
+            id=id_1,
+            name=name,
+            email=email_norm,
+            date_of_birth=date_of_birth,
+            owner_id = current_account.id
+        )
+        conflict = await AsyncContactRepository(session).insert_contact(contact)
+
+    error = CONFLICT_ERRORS.get(conflict, DEFAULT_CONFLICT_ERROR) if conflict else None
+    status_code = status.HTTP_400_BAD_REQUEST if conflict else status.HTTP_201_CREATED
+
+    return templates.TemplateResponse(
+        "contacts/add/contact_add_result.html",
+        {
+            "request": request,
+            "error": error,
+            "name": name,
+            "email": email_norm,
+            "id": id_1,
+            "date_of_birth": date_of_birth,
+        },
+        status_code=status_code,
+    )
+
+@async_contacts_router.post("/api/contacts/delete", name="api_contacts_delete")
+async def delete_contact(
+    request: Request,
+    id_1: int = Form(...),
+    session: AsyncSession = Depends(get_async_session),
+    current_account: Account = Depends(security.get_current_contact_async)
+
+) -> Response:
+    contact_repo = AsyncContactRepository(session)
+
+    success = await contact_repo.delete_by_id_and_owner(
+        contact_id=id_1,
+        owner_id=current_account.id,
+    )
+
+    status_code = status.HTTP_200_OK if success else status.HTTP_404_NOT_FOUND
+
+    return templates.TemplateResponse(
+        "contacts/delete/delete_result.html",
+        {"request": request, "success": success, "id": id_1},
+        status_code=status_code,
+    )
+
+@async_contacts_router.get("/pages/contacts/all", name="api_contacts_show_all")
+async def get_all_contacts(
+        request: Request,
+        after_id: Optional[int] = Query(None, ge=0),
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        session: AsyncSession = Depends(get_async_read_session),
+        current_account: Account = Depends(security.get_current_contact_async)
+) -> Response:
+    contact_repo = AsyncContactRepository(session)
+    headers = conditional.version_headers(current_account.id, await contact_repo.get_version(current_account.id))
+    if conditional.is_not_modified(request, headers):
+        return conditional.not_modified(headers)
+
+    contacts = contact_repo.stream_rows(
+        current_account.id, after_id=after_id, limit=limit, chunk_size=STREAM_CHUNK_SIZE,
+    )
+    return html_streamer.response_async(
+        "contacts/show_contacts.html",
+        {"request": request, "contacts": contacts, "page_size": limit, "after_id": after_id},
+        status_code=status.HTTP_200_OK,
+        headers=headers,
+    )
+
+@async_contacts_router.get("/api/contacts/all", name="json_contacts_show_all")
+async def get_contacts_json(
+        request: Request,
+        after_id: Optional[int] = Query(None, ge=0),
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        session: AsyncSession = Depends(get_async_read_session),
+        current_account: Account = Depends(security.get_current_contact_async)
+) -> Response:
+    contact_repo = AsyncContactRepository(session)
+    headers = conditional.version_headers(current_account.id, await contact_repo.get_version(current_account.id))
+    if conditional.is_not_modified(request, headers):
+        return conditional.not_modified(headers)
+
+    page_limit = None
+    if limit is None and after_id is None:
+        contacts_data = await contact_repo.get_rows(owner_id=current_account.id)
+    else:
+        page_limit = limit or MAX_PAGE_SIZE
+        contacts_data = await contact_repo.get_rows(
+            owner_id=current_account.id,
+            after_id=after_id,
+            limit=page_limit,
+        )
+
+    response = FastJSONResponse(content=contacts_data, headers=headers)
+    if page_limit is not None and len(contacts_data) == page_limit:
+        response.headers["X-Next-After-Id"] = str(contacts_data[-1]["id"])
+    return response
+
+####################################################################### Filtering Endpoints
+@async_contacts_router.post("/api/filters/age/above", name="api_age_above")
+async def contacts_above_show(
+        request: Request,
+        age: int = Form(...),
+        session: AsyncSession = Depends(get_async_read_session),
+        current_account: Account = Depends(security.get_current_contact_async)
+) -> Response:
+    contact_repo = AsyncContactRepository(session)
+    contacts = contact_repo.stream_rows(current_account.id, age_above_condition(age), chunk_size=STREAM_CHUNK_SIZE)
+    return html_streamer.response_async(
+        "contacts/filters/contacts_filter_result.html",
+        {"request": request, "age": age, "contacts": contacts},
+        status_code=status.HTTP_200_OK,
+    )
+
+@async_contacts_router.post("/api/filters/age/between", name="api_age_between")
+async def contacts_between_show(
+        request: Request,
+        min_age: int = Form(...),
+        max_age: int = Form(...),
+        session: AsyncSession = Depends(get_async_read_session),
+        current_account: Account = Depends(security.get_current_contact_async)
+) -> Response:
+    contact_repo = AsyncContactRepository(session)
+    contacts = contact_repo.stream_rows(
+        current_account.id, age_between_condition(min_age, max_age), chunk_size=STREAM_CHUNK_SIZE,
+    )
+    return html_streamer.response_async(
+        "contacts/filters/contacts_filter_result.html",
+        {"request": request, "min_age": min_age, "max_age": max_age, "contacts": contacts},
+        status_code=status.HTTP_200_OK,
+    )
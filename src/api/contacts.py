@@ -1,26 +1,53 @@
-from datetime import date
+from datetime import date, timedelta
+from typing import Iterator, Optional
 
-from fastapi import APIRouter, Depends, Form, Request, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlmodel import Session
 from starlette.responses import Response
 
-from src.core.api_globals import templates, security
-from src.core.db_global import get_session
-from src.database.contact_repository import ContactRepository
-from src.models.contact import Contact
+from src.core.api_globals import contact_writer, html_streamer, page_cache, templates, security
+from src.core import conditional, contact_export, contact_import, write_behind
+from src.core.db_global import get_read_session, get_session
+from src.core.json_response import FastJSONResponse, dumps_lines
+from src.core.stats_cache import stats_cache
+from src.database.contact_query import ContactQuery, SORT_COLUMNS
+from src.database.contact_repository import ContactRepository, age_above_condition, age_between_condition
+from src.database.owner_version_repository import OwnerVersionRepository
+from src.models.contact import Contact, ContactBatchDelete
 from src.models.account import Account
 
 contacts_router = APIRouter(
     dependencies=[Depends(security.auth_required)],
 )
 
+MAX_PAGE_SIZE = 1000
+STREAM_CHUNK_SIZE = 1000
+
+CONFLICT_ERRORS = {
+    "id": "Contact with this ID already exists!",
+    "email": "Contact with this Email already exists!",
+}
+DEFAULT_CONFLICT_ERROR = "Contact with this ID or Email already exists!"
+WRITE_BEHIND_CONFLICTS = {write_behind.DUPLICATE_ID: "id", write_behind.DUPLICATE_EMAIL: "email"}
+
+
+def _contact_to_dict(c: Contact) -> dict:
+    return {
+        "id": c.id,
+        "name": c.name,
+        "email": c.email,
+        "date_of_birth": c.date_of_birth.isoformat(),
+    }
+
+
+def _listing_headers(session: Session, owner_id: int) -> dict:
+    """ETag/Last-Modified for the owner's listings; one PK lookup, no contact SELECT."""
+    return conditional.version_headers(owner_id, OwnerVersionRepository(session).get(owner_id))
+
 @contacts_router.get("/pages/contacts/create", name="contacts_create_page")
 def create_contact_page(request: Request) -> Response:
-    return templates.TemplateResponse(
-        "contacts/add/contact_add.html",
-        {"request": request}
-    )
+    return page_cache.render(request, "contacts/add/contact_add.html")
 
 @contacts_router.post("/api/contacts/create", name="api_contacts_create")
 def contacts_create(
@@ -32,12 +59,19 @@ def contacts_create(
         session: Session = Depends(get_session),
         current_account: Account = Depends(security.get_current_contact)
 ) -> Response:
-    error = "Contact with this ID or Email already exists!"
-    status_code = status.HTTP_400_BAD_REQUEST
-    contact_repo = ContactRepository(session)
     email_norm = email.strip().casefold()
 
-    if not contact_repo.check_id_and_email(id_1, email):  # if not exists
+    if contact_writer.enabled:
+        ## group commit: wait for the batch holding this row to be committed
+        outcome = contact_writer.submit({
+            "id": id_1,
+            "name": name,
+            "email": email_norm,
+            "date_of_birth": date_of_birth,
+            "owner_id": current_account.id,
+        }).result()
+        conflict = None if outcome == write_behind.CREATED else WRITE_BEHIND_CONFLICTS.get(outcome, outcome)
+    else:
         contact = Contact(
             id=id_1,
             name=name,
@@ -45,10 +79,10 @@ def contacts_create(
             date_of_birth=date_of_birth,
             owner_id = current_account.id
         )
+        conflict = ContactRepository(session).insert_contact(contact)
 
-        contact_repo.add(contact)
-        error = None
-        status_code = status.HTTP_201_CREATED
+    error = CONFLICT_ERRORS.get(conflict, DEFAULT_CONFLICT_ERROR) if conflict else None
+    status_code = status.HTTP_400_BAD_REQUEST if conflict else status.HTTP_201_CREATED
 
     return templates.TemplateResponse(
         "contacts/add/contact_add_result.html",
@@ -63,13 +97,33 @@ def contacts_create(
         status_code=status_code,
     )
 
+@contacts_router.post("/api/contacts/import", name="api_contacts_import")
+def contacts_import(
+        file: UploadFile = File(...),
+        file_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$"),
+        batch_size: int = Query(contact_import.IMPORT_BATCH_SIZE, ge=1, le=5000),
+        session: Session = Depends(get_session),
+        current_account: Account = Depends(security.get_current_contact)
+) -> JSONResponse:
+    """Bulk-load contacts from a CSV (header: id,name,email,date_of_birth) or NDJSON upload."""
+    file_format = file_format or contact_import.detect_format(file.filename, file.content_type)
+    if file_format == "ndjson":
+        records = contact_import.iter_ndjson(file.file)
+    else:
+        records = contact_import.iter_csv(file.file)
+
+    importer = contact_import.ContactImporter(
+        ContactRepository(session),
+        owner_id=current_account.id,
+        batch_size=batch_size,
+    )
+    report = importer.run(records)
+    status_code = status.HTTP_200_OK if report["failed"] == 0 else status.HTTP_207_MULTI_STATUS
+    return JSONResponse(content=report, status_code=status_code)
+
 @contacts_router.get("/pages/contacts/delete", name="contacts_delete_page")
 def delete_contact_page(request: Request) -> Response:
-    return templates.TemplateResponse(
-        "contacts/delete/delete_contact.html",
-        {"request": request},
-        status_code=status.HTTP_200_OK,
-    )
+    return page_cache.render(request, "contacts/delete/delete_contact.html")
 
 @contacts_router.post("/api/contacts/delete", name="api_contacts_delete")
 def delete_contact(
@@ -94,70 +148,156 @@ def delete_contact(
         status_code=status_code,
     )
 
+@contacts_router.post("/api/contacts/delete/batch", name="api_contacts_delete_batch")
+def delete_contacts_batch(
+    criteria: ContactBatchDelete,
+    session: Session = Depends(get_session),
+    current_account: Account = Depends(security.get_current_contact)
+) -> JSONResponse:
+    """Delete the caller's contacts by id list, id range and/or creation age, in one statement."""
+    created_before = None
+    if criteria.older_than_days is not None:
+        created_before = date.today() - timedelta(days=criteria.older_than_days)
+    try:
+        deleted = ContactRepository(session).delete_many(
+            owner_id=current_account.id,
+            ids=criteria.ids,
+            id_from=criteria.id_from,
+            id_to=criteria.id_to,
+            created_before=created_before,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return JSONResponse(content={"deleted": deleted})
+
 @contacts_router.get("/pages/contacts/all", name="api_contacts_show_all")
 def get_all_contacts(
         request: Request,
-        session: Session = Depends(get_session)
+        after_id: Optional[int] = Query(None, ge=0),
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        session: Session = Depends(get_read_session),
+        current_account: Account = Depends(security.get_current_contact)
 ) -> Response:
+    """Stream the table as rows come off the cursor; `limit` switches to keyset pages with next/first links."""
+    headers = _listing_headers(session, current_account.id)
+    if conditional.is_not_modified(request, headers):
+        return conditional.not_modified(headers)
+
     contact_repo = ContactRepository(session)
-    contacts = contact_repo.get_all()
-    return templates.TemplateResponse(
+    contacts = contact_repo.stream_rows(
+        current_account.id, after_id=after_id, limit=limit, chunk_size=STREAM_CHUNK_SIZE,
+    )
+    return html_streamer.response(
         "contacts/show_contacts.html",
-        {"request": request, "contacts": contacts},
+        {"request": request, "contacts": contacts, "page_size": limit, "after_id": after_id},
         status_code=status.HTTP_200_OK,
+        headers=headers,
     )
 
 @contacts_router.get("/api/contacts/all", name="json_contacts_show_all")
 def get_contacts_json(
-        session: Session = Depends(get_session)
-) -> JSONResponse:
+        request: Request,
+        after_id: Optional[int] = Query(None, ge=0),
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        session: Session = Depends(get_read_session),
+        current_account: Account = Depends(security.get_current_contact)
+) -> Response:
+    headers = _listing_headers(session, current_account.id)
+    if conditional.is_not_modified(request, headers):
+        return conditional.not_modified(headers)
+
     contact_repo = ContactRepository(session)
-    contacts = contact_repo.get_all()
-    contacts_data = [
-        {
-            "id": c.id,
-            "name": c.name,
-            "email": c.email,
-            "date_of_birth": c.date_of_birth.isoformat(),
-        }
-        for c in contacts
-            ]
-    return JSONResponse(content=contacts_data)
+    page_limit = None
+    if limit is None and after_id is None:
+        contacts_data = contact_repo.get_rows(owner_id=current_account.id)
+    else:
+        page_limit = limit or MAX_PAGE_SIZE
+        contacts_data = contact_repo.get_rows(
+            owner_id=current_account.id,
+            after_id=after_id,
+            limit=page_limit,
+        )
+
+    response = FastJSONResponse(content=contacts_data, headers=headers)
+    if page_limit is not None and len(contacts_data) == page_limit:
+        response.headers["X-Next-After-Id"] = str(contacts_data[-1]["id"])
+    return response
+
+@contacts_router.get("/api/contacts/stream", name="ndjson_contacts_stream")
+def stream_contacts_ndjson(
+        request: Request,
+        chunk_size: int = Query(STREAM_CHUNK_SIZE, ge=1, le=10 * STREAM_CHUNK_SIZE),
+        session: Session = Depends(get_read_session),
+        current_account: Account = Depends(security.get_current_contact)
+) -> Response:
+    headers = _listing_headers(session, current_account.id)
+    if conditional.is_not_modified(request, headers):
+        return conditional.not_modified(headers)
+
+    contact_repo = ContactRepository(session)
+    owner_id = current_account.id
+
+    def ndjson_lines() -> Iterator[bytes]:
+        for chunk in contact_repo.iter_row_chunks(chunk_size=chunk_size, owner_id=owner_id):
+            yield dumps_lines(chunk)
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson", headers=headers)
+
+@contacts_router.get("/api/contacts/export", name="api_contacts_export")
+def export_contacts(
+        file_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+        gzip: bool = Query(True),
+        since_version: Optional[int] = Query(None, ge=0, description="X-Export-Version of a previous export"),
+        since: Optional[date] = Query(None, description="only contacts created on or after this date (whole days)"),
+        chunk_size: int = Query(STREAM_CHUNK_SIZE, ge=1, le=10 * STREAM_CHUNK_SIZE),
+        session: Session = Depends(get_read_session),
+        current_account: Account = Depends(security.get_current_contact)
+) -> Response:
+    """Stream the caller's contacts as (gzipped) CSV or NDJSON, with constant memory.
+
+    For incremental syncs pass the previous response's X-Export-Version as
+    `since_version`; only contacts inserted after that export are sent,
+    whatever their ids. `since` filters by creation date, at day granularity.
+    """
+    contact_repo = ContactRepository(session)
+    owner_id = current_account.id
+    owner_version = OwnerVersionRepository(session).get(owner_id)
+    until_version = owner_version.version if owner_version is not None else 0
+
+    chunks = contact_repo.iter_export(
+        owner_id, since_version=since_version, since_created=since, until_version=until_version, chunk_size=chunk_size,
+    )
+    filename = f"contacts.{file_format}" + (".gz" if gzip else "")
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Export-Version": str(until_version),
+    }
+    media_type = "application/gzip" if gzip else contact_export.MEDIA_TYPES[file_format]
+    return StreamingResponse(contact_export.encode(chunks, file_format, compress=gzip), media_type=media_type, headers=headers)
 
 ####################################################################### Filtering Endpoints
 @contacts_router.get("/pages/filters/menu", name="filters_menu_page")
 def filter_page(request: Request) -> Response:
-    return templates.TemplateResponse(
-        "contacts/filters/contacts_filter_page.html",
-        {"request": request},
-        status_code=status.HTTP_200_OK,
-    )
+    return page_cache.render(request, "contacts/filters/contacts_filter_page.html")
 
 @contacts_router.get("/pages/filters/age/above", name="filter_age_above_page")
 def contacts_above_page(request: Request) -> Response:
-    return templates.TemplateResponse(
-        "contacts/filters/filter_contacts_age_above.html",
-        {"request": request},
-        status_code=status.HTTP_200_OK,
-    )
+    return page_cache.render(request, "contacts/filters/filter_contacts_age_above.html")
 
 @contacts_router.get("/pages/filters/age/between", name="filter_age_between_page")
 def contacts_between_page(request: Request) -> Response:
-    return templates.TemplateResponse(
-        "contacts/filters/filter_contacts_age_between.html",
-        {"request": request},
-        status_code=status.HTTP_200_OK,
-    )
+    return page_cache.render(request, "contacts/filters/filter_contacts_age_between.html")
 
 @contacts_router.post("/api/filters/age/above", name="api_age_above")
 def contacts_above_show(
         request: Request,
         age: int = Form(...),
-        session: Session = Depends(get_session),
+        session: Session = Depends(get_read_session),
+        current_account: Account = Depends(security.get_current_contact)
 ) -> Response:
     contact_repo = ContactRepository(session)
-    contacts = contact_repo.get_contacts_above_age(age)
-    return templates.TemplateResponse(
+    contacts = contact_repo.stream_rows(current_account.id, age_above_condition(age), chunk_size=STREAM_CHUNK_SIZE)
+    return html_streamer.response(
         "contacts/filters/contacts_filter_result.html",
         {"request": request, "age": age, "contacts": contacts},
         status_code=status.HTTP_200_OK,
@@ -168,32 +308,109 @@ def contacts_between_show(
         request: Request,
         min_age: int = Form(...),
         max_age: int = Form(...),
-        session: Session = Depends(get_session),
+        session: Session = Depends(get_read_session),
+        current_account: Account = Depends(security.get_current_contact)
 ) -> Response:
     contact_repo = ContactRepository(session)
-    contacts = contact_repo.get_contacts_between_age(min_age, max_age)
-    return templates.TemplateResponse(
+    contacts = contact_repo.stream_rows(
+        current_account.id, age_between_condition(min_age, max_age), chunk_size=STREAM_CHUNK_SIZE,
+    )
+    return html_streamer.response(
         "contacts/filters/contacts_filter_result.html",
         {"request": request, "min_age": min_age, "max_age": max_age, "contacts": contacts},
         status_code=status.HTTP_200_OK,
     )
 
+@contacts_router.get("/api/contacts/query", name="api_contacts_query")
+def contacts_query(
+        min_age: Optional[int] = Query(None, ge=0),
+        max_age: Optional[int] = Query(None, ge=0),
+        name_prefix: Optional[str] = Query(None, min_length=1),
+        email_prefix: Optional[str] = Query(None, min_length=1),
+        created_from: Optional[date] = Query(None),
+        created_to: Optional[date] = Query(None),
+        is_active: Optional[bool] = Query(None),
+        sort: str = Query("id", pattern="^(" + "|".join(SORT_COLUMNS) + ")$"),
+        order: str = Query("asc", pattern="^(asc|desc)$"),
+        limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+        offset: int = Query(0, ge=0),
+        after_id: Optional[int] = Query(None, ge=0),
+        session: Session = Depends(get_read_session),
+        current_account: Account = Depends(security.get_current_contact)
+) -> JSONResponse:
+    """Combined filter over the caller's contacts, with SQL-side count, sort and paging."""
+    try:
+        spec = ContactQuery(
+            owner_id=current_account.id,
+            min_age=min_age,
+            max_age=max_age,
+            name_prefix=name_prefix,
+            email_prefix=email_prefix,
+            created_from=created_from,
+            created_to=created_to,
+            is_active=is_active,
+            sort=sort,
+            descending=order == "desc",
+            limit=limit,
+            offset=offset,
+            after_id=after_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    contacts, total = ContactRepository(session).query(spec)
+    next_after_id = contacts[-1].id if sort == "id" and len(contacts) == limit else None
+    return FastJSONResponse(content={
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "next_after_id": next_after_id,
+        "items": [_contact_to_dict(c) for c in contacts],
+    })
+
+@contacts_router.get("/api/contacts/search", name="api_contacts_search")
+def contacts_search(
+        q: str = Query(..., min_length=1, max_length=200),
+        limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+        offset: int = Query(0, ge=0),
+        session: Session = Depends(get_read_session),
+        current_account: Account = Depends(security.get_current_contact)
+) -> JSONResponse:
+    """Full-text prefix search over the caller's contacts' names and emails."""
+    items = ContactRepository(session).search(q, owner_id=current_account.id, limit=limit, offset=offset)
+    return FastJSONResponse(content={
+        "query": q,
+        "limit": limit,
+        "offset": offset,
+        "next_offset": offset + limit if len(items) == limit else None,
+        "items": items,
+    })
+
+@contacts_router.get("/api/contacts/stats", name="api_contacts_stats")
+def contacts_stats(
+        bucket: int = Query(10, ge=1, le=100),
+        days: int = Query(30, ge=1, le=366),
+        session: Session = Depends(get_read_session),
+        current_account: Account = Depends(security.get_current_contact)
+) -> JSONResponse:
+    """Totals, age histogram (`bucket` years wide) and contacts created per day over the last `days`."""
+    owner_id = current_account.id
+    owner_version = OwnerVersionRepository(session).get(owner_id)
+    version = owner_version.version if owner_version else 0
+
+    key = stats_cache.key(owner_id, version, bucket, days)
+    stats = stats_cache.get(key)
+    cached = stats is not None
+    if not cached:
+        stats = ContactRepository(session).get_stats(owner_id, bucket_width=bucket, days=days)
+        stats_cache.put(key, stats)
+
+    return FastJSONResponse(content={"version": version, "bucket": bucket, "days": days, "cached": cached, **stats})
 
 @contacts_router.get("/api/debug/contacts", name="debug_contacts_all")
 def debug_contacts_all(
-    session: Session = Depends(get_session),
+    owner_id: Optional[int] = Query(None),
+    session: Session = Depends(get_read_session),
 ) -> JSONResponse:
     contact_repo = ContactRepository(session)
-    contacts = contact_repo.get_all()
-
-    data = [
-        {
-            "id": c.id,
-            "name": c.name,
-            "email": c.email,
-            "date_of_birth": c.date_of_birth.isoformat(),
-            "owner_id": c.owner_id,
-        }
-        for c in contacts
-    ]
-    return JSONResponse(content=data)
+    return FastJSONResponse(content=contact_repo.get_rows(owner_id=owner_id, with_owner=True))
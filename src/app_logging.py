@@ -1,7 +1,16 @@
+import atexit
 import logging
+import queue
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
-def configure_logging(level: int = logging.INFO) -> None:
+_listener: Optional[QueueListener] = None
+
+def configure_logging(level: int = logging.INFO, queued: bool = True) -> None:
+    """Console logging; with `queued` the request path only enqueues records and a
+    background listener thread formats and writes them."""
+    global _listener
     dictConfig({
         "version": 1,
         "disable_existing_loggers": False,
@@ -20,6 +29,27 @@ def configure_logging(level: int = logging.INFO) -> None:
         },
         "root": {"handlers": ["console"], "level": level},
     })
+    if not queued:
+        return
+
+    stop_logging()
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
+
+def stop_logging() -> None:
+    """Flush queued records and stop the background listener (safe to call twice)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 def get_logger(name: str = "src") -> logging.Logger:
     return logging.getLogger(name)
@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from src.models.account import Account
+
+
+class AccountCache:
+    """In-process TTL + LRU cache of active accounts, keyed by account id.
+
+    Used by `Security.get_current_contact` so that an authenticated request
+    does not need a DB round trip just to re-confirm `is_active`.
+
+    Entries are detached copies, safe to share across sessions and threads.
+    Staleness is bounded by the TTL; writes that deactivate or delete an
+    account call `invalidate`, which also notifies registered listeners so
+    other workers can drop their copy (e.g. by publishing the id on a bus and
+    calling `invalidate(account_id, propagate=False)` on receipt).
+
+    Configured from the environment:
+        ACCOUNT_CACHE_SIZE  max entries (default: 1024, 0 disables the cache)
+        ACCOUNT_CACHE_TTL   seconds an entry stays valid (default: 30)
+    """
+
+    def __init__(self, max_size: int = None, ttl_seconds: float = None) -> None:
+        self.max_size = max_size if max_size is not None else int(os.getenv("ACCOUNT_CACHE_SIZE", "1024"))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("ACCOUNT_CACHE_TTL", "30"))
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[int], None]] = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, account_id: int) -> Optional[Account]:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(account_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[account_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(account_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, account: Account) -> None:
+        if not self.enabled or account.id is None:
+            return
+        detached = Account.model_validate(account.model_dump())
+        expires = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[account.id] = (expires, detached)
+            self._entries.move_to_end(account.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, account_id: int, propagate: bool = True) -> None:
+        with self._lock:
+            self._entries.pop(account_id, None)
+            self.invalidations += 1
+        if propagate:
+            for listener in list(self._listeners):
+                listener(account_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def add_invalidation_listener(self, listener: Callable[[int], None]) -> None:
+        """Register a cross-worker hook, called with the id of every invalidated account."""
+        self._listeners.append(listener)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+account_cache = AccountCache()
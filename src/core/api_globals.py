@@ -1,7 +1,20 @@
 
 from fastapi.templating import Jinja2Templates
+from src.core.html_stream import TemplateStreamer
+from src.core.page_cache import StaticPageCache
+from src.core.rate_limit import LoginRateLimiter
+from src.core.db_global import get_db
 from src.core.security import Security
+from src.core.write_behind import ContactWriteQueue
 
 templates = Jinja2Templates(directory="src/templates")
 
+page_cache = StaticPageCache(templates)
+
+html_streamer = TemplateStreamer(templates)
+
 security = Security()
+
+login_limiter = LoginRateLimiter()
+
+contact_writer = ContactWriteQueue(lambda: get_db().get_session())
@@ -0,0 +1,54 @@
+from datetime import timezone
+from email.utils import format_datetime
+from typing import Optional
+
+from fastapi import Request
+from starlette.responses import Response
+
+from src.models.owner_version import OwnerVersion
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match covers `etag` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+def version_headers(owner_id: int, owner_version: Optional[OwnerVersion]) -> dict:
+    """ETag / Last-Modified for an owner's contact listings, derived from their change version."""
+    if owner_version is None:
+        return {"ETag": f'W/"{owner_id}-0"', "Cache-Control": "private, no-cache"}
+
+    updated_at = owner_version.updated_at
+    if updated_at.tzinfo is None:  # SQLite hands back naive datetimes
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    stamp = int(updated_at.timestamp() * 1_000_000)
+    return {
+        "ETag": f'W/"{owner_id}-{owner_version.version}-{stamp}"',
+        "Last-Modified": format_datetime(updated_at.replace(microsecond=0), usegmt=True),
+        "Cache-Control": "private, no-cache",
+    }
+
+
+def is_not_modified(request: Request, headers: dict) -> bool:
+    """Decided by the ETag (change version) alone.
+
+    Last-Modified is informational: HTTP dates have whole-second resolution,
+    so If-Modified-Since can't tell apart two writes in the same second.
+    """
+    return etag_matches(request, headers["ETag"])
+
+
+def not_modified(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
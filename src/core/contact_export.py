@@ -0,0 +1,44 @@
+import csv
+import io
+import zlib
+from typing import Iterable, Iterator, List
+
+from src.core.json_response import dumps_lines
+from src.database.contact_repository import EXPORT_COLUMNS
+
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def csv_chunks(chunks: Iterable[List[tuple]]) -> Iterator[bytes]:
+    """Header line, then one CSV block per chunk of rows (same columns as the import accepts)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue().encode("utf-8")
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def ndjson_chunks(chunks: Iterable[List[tuple]]) -> Iterator[bytes]:
+    for chunk in chunks:
+        yield dumps_lines(dict(zip(EXPORT_FIELDS, row)) for row in chunk)
+
+
+def gzip_chunks(blocks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream into a single gzip member, block by block."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for block in blocks:
+        compressed = compressor.compress(block)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def encode(chunks: Iterable[List[tuple]], file_format: str, compress: bool = True) -> Iterator[bytes]:
+    blocks = csv_chunks(chunks) if file_format == "csv" else ndjson_chunks(chunks)
+    return gzip_chunks(blocks) if compress else blocks
@@ -0,0 +1,162 @@
+import csv
+import io
+import json
+import os
+import time
+from datetime import date
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from src.database.contact_repository import ContactRepository
+
+IMPORT_BATCH_SIZE = int(os.getenv("CONTACT_IMPORT_BATCH_SIZE", "1000"))
+MAX_REPORTED_ERRORS = 1000
+
+REQUIRED_FIELDS = ("id", "name", "email", "date_of_birth")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    name = (filename or "").lower()
+    ctype = (content_type or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in ctype or "jsonl" in ctype:
+        return "ndjson"
+    return "csv"
+
+
+def iter_csv(stream: BinaryIO) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (row number, raw record, parse error) one line at a time.
+
+    Undecodable or malformed input can't be resynchronised: it is reported
+    once, at the first row not read, and the rest of the file is skipped.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    row_no = 0
+    while True:
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except UnicodeDecodeError:
+            yield row_no + 1, None, "file is not valid UTF-8; this and the following rows were not imported"
+            return
+        except csv.Error as exc:
+            yield row_no + 1, None, f"malformed CSV ({exc}); this and the following rows were not imported"
+            return
+        row_no += 1
+        yield row_no, record, None
+
+
+def iter_ndjson(stream: BinaryIO) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    row_no = 0
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        row_no += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row_no, None, "invalid JSON"
+            continue
+        if not isinstance(record, dict):
+            yield row_no, None, "expected a JSON object"
+            continue
+        yield row_no, record, None
+
+
+def parse_record(record: dict) -> dict:
+    """Validate one raw record and turn it into a `contact` column dict (ValueError on bad input)."""
+    missing = [f for f in REQUIRED_FIELDS if record.get(f) in (None, "")]
+    if missing:
+        raise ValueError(f"missing field(s): {', '.join(missing)}")
+    try:
+        contact_id = int(record["id"])
+    except (TypeError, ValueError):
+        raise ValueError("id must be an integer")
+    try:
+        dob = date.fromisoformat(str(record["date_of_birth"]).strip())
+    except ValueError:
+        raise ValueError("date_of_birth must be YYYY-MM-DD")
+    return {
+        "id": contact_id,
+        "name": str(record["name"]).strip(),
+        "email": str(record["email"]).strip().casefold(),
+        "date_of_birth": dob,
+    }
+
+
+class ContactImporter:
+    """Streams parsed records into the contact table in batches.
+
+    Each batch is checked for duplicates with two set-based queries (ids and
+    emails already stored) plus the ids/emails seen earlier in the upload,
+    then written with a single executemany and committed, so a failure late
+    in a large upload keeps the batches that were already imported.
+    """
+
+    def __init__(self, repo: ContactRepository, owner_id: int, batch_size: int = IMPORT_BATCH_SIZE) -> None:
+        self.repo = repo
+        self.owner_id = owner_id
+        self.batch_size = batch_size
+        self.rows = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self._seen_ids = set()
+        self._seen_emails = set()
+
+    def _error(self, row_no: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_no, "error": message})
+
+    def _flush(self, batch: List[Tuple[int, dict]]) -> None:
+        if not batch:
+            return
+        taken_ids = self.repo.existing_ids(row["id"] for _, row in batch)
+        taken_emails = self.repo.existing_emails(row["email"] for _, row in batch)
+        today = date.today()
+
+        to_insert = []
+        for row_no, row in batch:
+            if row["id"] in taken_ids or row["id"] in self._seen_ids:
+                self._error(row_no, f"duplicate id {row['id']}")
+                continue
+            if row["email"] in taken_emails or row["email"] in self._seen_emails:
+                self._error(row_no, f"duplicate email {row['email']}")
+                continue
+            self._seen_ids.add(row["id"])
+            self._seen_emails.add(row["email"])
+            to_insert.append({**row, "owner_id": self.owner_id, "is_active": True, "created_at": today})
+
+        self.inserted += self.repo.bulk_insert(to_insert)
+        self.repo.session.commit()
+
+    def run(self, records: Iterator[Tuple[int, Optional[dict], Optional[str]]]) -> dict:
+        start = time.perf_counter()
+        batch: List[Tuple[int, dict]] = []
+        for row_no, record, parse_error in records:
+            self.rows += 1
+            if parse_error:
+                self._error(row_no, parse_error)
+                continue
+            try:
+                batch.append((row_no, parse_record(record)))
+            except ValueError as exc:
+                self._error(row_no, str(exc))
+                continue
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        self._flush(batch)
+
+        elapsed = time.perf_counter() - start
+        return {
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 4),
+            "rows_per_second": round(self.rows / elapsed, 1) if elapsed > 0 else None,
+            "errors": sorted(self.errors, key=lambda e: e["row"]),
+            "errors_truncated": self.failed > len(self.errors),
+        }
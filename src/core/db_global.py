@@ -1,16 +1,43 @@
-from typing import Iterator
+import os
+import threading
+from typing import AsyncIterator, Iterator, Optional
 
-from fastapi.templating import Jinja2Templates
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.database import db_core
+from src.database import async_db_core
 
-templates = Jinja2Templates(directory="src/templates")
+## "sync" (default) or "async" - async mode serves the contacts API from an AsyncEngine
+DB_MODE = os.getenv("DB_MODE", "sync").strip().lower()
 
-db = db_core.DBCore()
+## Engines are created on first use (normally by the app lifespan), not at import,
+## so importing the app - or spawning a worker - does no database work.
+_db: Optional[db_core.DBCore] = None
+_async_db: Optional[async_db_core.AsyncDBCore] = None
+_init_lock = threading.Lock()
+
+def get_db() -> db_core.DBCore:
+    """The process-wide DBCore; the first call opens the engine and migrates the schema."""
+    global _db
+    if _db is None:
+        with _init_lock:
+            if _db is None:
+                _db = db_core.DBCore()
+    return _db
+
+def get_async_db() -> Optional[async_db_core.AsyncDBCore]:
+    """The process-wide AsyncDBCore, or None unless DB_MODE=async."""
+    global _async_db
+    if _async_db is None and DB_MODE == "async":
+        get_db()  # same database: the sync DBCore migrates it on first use
+        with _init_lock:
+            if _async_db is None:
+                _async_db = async_db_core.AsyncDBCore()
+    return _async_db
 
 def get_session() -> Iterator[Session]:
-    s = db.get_session()
+    s = get_db().get_session()
     try:
         yield s
         s.commit()
@@ -19,3 +46,35 @@ def get_session() -> Iterator[Session]:
         raise
     finally:
         s.close()
+
+def get_read_session() -> Iterator[Session]:
+    """For routes that only read: writes are refused and the request ends in a rollback."""
+    s = get_db().get_read_session()
+    try:
+        yield s
+    finally:
+        s.close()
+
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    async_db = get_async_db()
+    if async_db is None:
+        raise RuntimeError("Async sessions require DB_MODE=async")
+    s = async_db.get_session()
+    try:
+        yield s
+        await s.commit()
+    except Exception:
+        await s.rollback()
+        raise
+    finally:
+        await s.close()
+
+async def get_async_read_session() -> AsyncIterator[AsyncSession]:
+    async_db = get_async_db()
+    if async_db is None:
+        raise RuntimeError("Async sessions require DB_MODE=async")
+    s = async_db.get_read_session()
+    try:
+        yield s
+    finally:
+        await s.close()
@@ -0,0 +1,177 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+_pwd: Optional["CryptContext"] = None
+
+
+def _context() -> "CryptContext":
+    # built (and passlib imported) on first use, so start-up and process-pool
+    # workers only pay for it once a password is actually hashed
+    global _pwd
+    if _pwd is None:
+        from passlib.context import CryptContext
+        _pwd = CryptContext(schemes=["argon2"], deprecated="auto")
+    return _pwd
+
+
+def argon2_hash(password: str) -> str:
+    return _context().hash(password)
+
+
+def argon2_verify(plain_password: str, hashed_password: str) -> bool:
+    return _context().verify(plain_password, hashed_password)
+
+
+def _timed(fn: Callable, *args: Any):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class HashPoolBusy(Exception):
+    """Raised when the hash pool queue is full; callers should answer 503."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Password hashing pool is busy")
+        self.retry_after = retry_after
+
+
+class HashPool:
+    """Bounded worker pool for Argon2 work, isolated from the request threadpool.
+
+    At most `workers + queue_size` jobs are admitted at once; anything beyond
+    that is rejected immediately with `HashPoolBusy` instead of queueing.
+    Async routes await `hash_async` / `verify_async`, so a queued job holds
+    no request thread while it waits.
+
+    Configured from the environment:
+        HASH_POOL_KIND         "thread" (default) or "process"
+        HASH_POOL_WORKERS      worker count (default: min(4, cpu count))
+        HASH_POOL_QUEUE        jobs allowed to wait for a worker (default: 4 * workers)
+        HASH_POOL_RETRY_AFTER  seconds advertised in Retry-After when busy (default: 1)
+    """
+
+    def __init__(
+        self,
+        kind: str = None,
+        workers: int = None,
+        queue_size: int = None,
+        retry_after: int = None,
+    ) -> None:
+        self.kind = (kind or os.getenv("HASH_POOL_KIND", "thread")).strip().lower()
+        self.workers = workers or int(os.getenv("HASH_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.queue_size = queue_size if queue_size is not None else int(
+            os.getenv("HASH_POOL_QUEUE", str(4 * self.workers))
+        )
+        self.retry_after = retry_after or int(os.getenv("HASH_POOL_RETRY_AFTER", "1"))
+
+        self._executor: Optional[Executor] = None
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._hash_seconds_total = 0.0
+        self._hash_seconds_max = 0.0
+        self._wait_seconds_total = 0.0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="argon2"
+                    )
+            return self._executor
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def submit(self, fn: Callable, *args: Any) -> "Future[Any]":
+        """Queue `fn(*args)` on the pool without waiting; raises HashPoolBusy when saturated."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashPoolBusy(self.retry_after)
+
+        with self._lock:
+            self._in_flight += 1
+        submitted = time.perf_counter()
+        try:
+            inner = self._get_executor().submit(_timed, fn, *args)
+        except BaseException:
+            self._release()
+            raise
+
+        outer: "Future[Any]" = Future()
+
+        def _done(job: Future) -> None:
+            total = time.perf_counter() - submitted
+            self._release()
+            error = job.exception()
+            if error is not None:
+                outer.set_exception(error)
+                return
+            result, hash_seconds = job.result()
+            with self._lock:
+                self._completed += 1
+                self._hash_seconds_total += hash_seconds
+                self._hash_seconds_max = max(self._hash_seconds_max, hash_seconds)
+                self._wait_seconds_total += max(0.0, total - hash_seconds)
+            outer.set_result(result)
+
+        inner.add_done_callback(_done)
+        return outer
+
+    def run(self, fn: Callable, *args: Any) -> Any:
+        """Run `fn(*args)` on the pool and wait for the result."""
+        return self.submit(fn, *args).result()
+
+    def hash(self, password: str) -> str:
+        return self.run(argon2_hash, password)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self.run(argon2_verify, plain_password, hashed_password)
+
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self.submit(argon2_hash, password))
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self.submit(argon2_verify, plain_password, hashed_password))
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self._completed
+            return {
+                "kind": self.kind,
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.workers),
+                "completed": completed,
+                "rejected": self._rejected,
+                "hash_seconds_avg": self._hash_seconds_total / completed if completed else 0.0,
+                "hash_seconds_max": self._hash_seconds_max,
+                "wait_seconds_avg": self._wait_seconds_total / completed if completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
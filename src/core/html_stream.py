@@ -0,0 +1,73 @@
+import os
+from typing import AsyncIterator, Iterator, Mapping, Optional
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment
+from starlette.responses import StreamingResponse
+
+
+class TemplateStreamer:
+    """Renders a template with Jinja's `generate()` straight into a StreamingResponse.
+
+    The context may hold lazy iterables (e.g. a DB cursor); rows are pulled as
+    the template reaches them, so memory is bounded by the cursor's chunk size
+    rather than the result size. Output is sent in blocks of roughly
+    `flush_bytes`; the first block (the page head) is sent immediately so the
+    browser can start painting.
+
+    Configured from the environment:
+        HTML_STREAM_FLUSH_BYTES  bytes buffered per network write (default: 16384)
+    """
+
+    def __init__(self, templates: Jinja2Templates, flush_bytes: int = None) -> None:
+        self.templates = templates
+        self.flush_bytes = flush_bytes or int(os.getenv("HTML_STREAM_FLUSH_BYTES", "16384"))
+        self._async_env: Optional[Environment] = None
+
+    def _blocks(self, pieces: Iterator[str]) -> Iterator[bytes]:
+        buffer, size, first = [], 0, True
+        for piece in pieces:
+            buffer.append(piece)
+            size += len(piece)
+            if first or size >= self.flush_bytes:
+                yield "".join(buffer).encode("utf-8")
+                buffer, size, first = [], 0, False
+        if buffer:
+            yield "".join(buffer).encode("utf-8")
+
+    async def _blocks_async(self, pieces: AsyncIterator[str]) -> AsyncIterator[bytes]:
+        buffer, size, first = [], 0, True
+        async for piece in pieces:
+            buffer.append(piece)
+            size += len(piece)
+            if first or size >= self.flush_bytes:
+                yield "".join(buffer).encode("utf-8")
+                buffer, size, first = [], 0, False
+        if buffer:
+            yield "".join(buffer).encode("utf-8")
+
+    def response(
+        self, name: str, context: Mapping, status_code: int = 200, headers: Mapping[str, str] = None
+    ) -> StreamingResponse:
+        template = self.templates.get_template(name)
+        return StreamingResponse(
+            self._blocks(template.generate(context)),
+            status_code=status_code,
+            headers=headers,
+            media_type="text/html; charset=utf-8",
+        )
+
+    def response_async(
+        self, name: str, context: Mapping, status_code: int = 200, headers: Mapping[str, str] = None
+    ) -> StreamingResponse:
+        """Like `response`, for contexts holding async iterables (async DB cursors)."""
+        if self._async_env is None:
+            # same loader, filters and globals; templates compiled for async iteration
+            self._async_env = self.templates.env.overlay(enable_async=True)
+        template = self._async_env.get_template(name)
+        return StreamingResponse(
+            self._blocks_async(template.generate_async(context)),
+            status_code=status_code,
+            headers=headers,
+            media_type="text/html; charset=utf-8",
+        )
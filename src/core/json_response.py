@@ -0,0 +1,37 @@
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json is the fallback
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON; dates/datetimes become ISO 8601 strings."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_lines(items) -> bytes:
+    """NDJSON encoding of an iterable of objects."""
+    if orjson is not None:
+        return b"".join(orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE) for item in items)
+    return b"".join(dumps(item) + b"\n" for item in items)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when installed, with native date support either way."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,82 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.templating import Jinja2Templates
+from starlette.responses import Response
+
+from src.core.conditional import etag_matches
+
+
+class _Entry:
+    __slots__ = ("body", "etag", "uptodate")
+
+    def __init__(self, body: bytes, etag: str, uptodate: Optional[Callable[[], bool]]) -> None:
+        self.body = body
+        self.etag = etag
+        self.uptodate = uptodate
+
+
+class StaticPageCache:
+    """Renders request-independent Jinja pages once and serves the cached bytes.
+
+    Pages only vary by the app's base URL (they call `request.url_for`), so
+    the cache key is (template name, base URL). The base URL comes from the
+    client's Host header, so the cache is an LRU bounded at `max_size`
+    entries; arbitrary Host values only evict each other.
+
+    Each entry carries a strong ETag; a matching If-None-Match is answered
+    with 304 and no body.
+
+    Configured from the environment:
+        PAGE_CACHE_SIZE        max entries (default: 64)
+        TEMPLATES_AUTO_RELOAD  1 (set by the dev server) makes every hit ask the
+                               Jinja loader whether the template file changed
+                               and re-render if so
+    """
+
+    def __init__(self, templates: Jinja2Templates, auto_reload: bool = None, max_size: int = None) -> None:
+        self.templates = templates
+        if auto_reload is None:
+            auto_reload = os.getenv("TEMPLATES_AUTO_RELOAD", "0") == "1"
+        self.auto_reload = auto_reload
+        self.max_size = max_size if max_size is not None else int(os.getenv("PAGE_CACHE_SIZE", "64"))
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _render(self, request: Request, name: str) -> _Entry:
+        env = self.templates.env
+        _, _, uptodate = env.loader.get_source(env, name)
+        body = env.get_template(name).render({"request": request}).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        return _Entry(body, etag, uptodate)
+
+    def get(self, request: Request, name: str) -> _Entry:
+        key = (name, str(request.base_url))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None or (self.auto_reload and entry.uptodate is not None and not entry.uptodate()):
+            entry = self._render(request, name)
+            if self.max_size > 0:
+                with self._lock:
+                    self._entries[key] = entry
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+        return entry
+
+    def render(self, request: Request, name: str, status_code: int = 200) -> Response:
+        entry = self.get(request, name)
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if etag_matches(request, entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, status_code=status_code, media_type="text/html", headers=headers)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,199 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional, Tuple
+
+
+class RateLimited(Exception):
+    """Raised when a caller has used up its attempts; callers should answer 429."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Too many attempts")
+        self.retry_after = retry_after
+
+
+class BucketRule:
+    """Token bucket: `burst` attempts at once, refilled at `per_minute` per minute."""
+
+    def __init__(self, burst: int, per_minute: float) -> None:
+        self.burst = float(burst)
+        self.rate = per_minute / 60.0
+
+    def take(self, tokens: Optional[float], updated: Optional[float], now: float) -> Tuple[bool, float, float]:
+        """Apply one attempt to a bucket state; returns (allowed, new_tokens, retry_after)."""
+        if tokens is None:
+            tokens = self.burst
+        else:
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+        if tokens >= 1.0:
+            return True, tokens - 1.0, 0.0
+        return False, tokens, (1.0 - tokens) / self.rate if self.rate > 0 else 60.0
+
+    def idle_seconds(self) -> float:
+        """Time after which an untouched bucket is full again and can be forgotten."""
+        return self.burst / self.rate if self.rate > 0 else 3600.0
+
+
+class MemoryBucketStore:
+    """Per-process buckets in an LRU-bounded dict; limits apply per worker."""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rule: BucketRule, now: float) -> Tuple[bool, float]:
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (None, None))
+            allowed, tokens, retry_after = rule.take(tokens, updated, now)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBucketStore:
+    """Buckets in a small SQLite file, shared by every worker process on the host.
+
+    Each attempt is one read-modify-write inside `BEGIN IMMEDIATE`, so
+    concurrent workers serialise on the file lock and never lose an update.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_bucket ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, rule: BucketRule, now: float) -> Tuple[bool, float]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM rate_bucket WHERE key = ?", (key,)).fetchone()
+            allowed, tokens, retry_after = rule.take(*(row or (None, None)), now)
+            conn.execute(
+                "INSERT INTO rate_bucket(key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            self._calls += 1
+            if self._calls % self.PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM rate_bucket WHERE updated < ?", (now - rule.idle_seconds(),))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, retry_after
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM rate_bucket")
+
+
+class LoginRateLimiter:
+    """Limits login attempts per username and per client IP before any Argon2 work.
+
+    Every attempt takes a token from both the username bucket and the IP
+    bucket; if either is empty the attempt is rejected with `RateLimited`.
+
+    Configured from the environment:
+        LOGIN_RATE_LIMIT             "memory" (default), "sqlite" (shared across workers) or "off"
+        LOGIN_RATE_LIMIT_PATH        SQLite file for the shared backend (default: ratelimit.db)
+        LOGIN_RATE_USER_BURST        attempts per username before throttling (default: 5)
+        LOGIN_RATE_USER_PER_MINUTE   username refill rate (default: 5)
+        LOGIN_RATE_IP_BURST          attempts per IP before throttling (default: 20)
+        LOGIN_RATE_IP_PER_MINUTE     IP refill rate (default: 60)
+    """
+
+    def __init__(self, backend: str = None, clock: Callable[[], float] = time.time) -> None:
+        self.backend = (backend or os.getenv("LOGIN_RATE_LIMIT", "memory")).strip().lower()
+        self.user_rule = BucketRule(
+            int(os.getenv("LOGIN_RATE_USER_BURST", "5")),
+            float(os.getenv("LOGIN_RATE_USER_PER_MINUTE", "5")),
+        )
+        self.ip_rule = BucketRule(
+            int(os.getenv("LOGIN_RATE_IP_BURST", "20")),
+            float(os.getenv("LOGIN_RATE_IP_PER_MINUTE", "60")),
+        )
+        self._clock = clock
+        self._store = None
+        self._store_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._allowed = 0
+        self._rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend != "off"
+
+    @property
+    def blocking(self) -> bool:
+        """True when `check` does file I/O (the shared SQLite store) and so belongs off the event loop."""
+        return self.backend == "sqlite"
+
+    def _get_store(self):
+        # opened lazily so each worker process gets its own handle
+        with self._store_lock:
+            if self._store is None:
+                if self.backend == "sqlite":
+                    self._store = SQLiteBucketStore(os.getenv("LOGIN_RATE_LIMIT_PATH", "ratelimit.db"))
+                else:
+                    self._store = MemoryBucketStore()
+            return self._store
+
+    def _buckets(self, username: str, client_ip: Optional[str]) -> Iterable[Tuple[str, BucketRule]]:
+        yield f"user:{username}", self.user_rule
+        if client_ip:
+            yield f"ip:{client_ip}", self.ip_rule
+
+    def check(self, username: str, client_ip: Optional[str]) -> None:
+        """Take one attempt for `username` from `client_ip`, or raise `RateLimited`."""
+        if not self.enabled:
+            return
+        store = self._get_store()
+        now = self._clock()
+        retry_after = 0.0
+        for key, rule in self._buckets(username, client_ip):
+            allowed, wait = store.take(key, rule, now)
+            if not allowed:
+                retry_after = max(retry_after, wait)
+
+        with self._stats_lock:
+            if retry_after:
+                self._rejected += 1
+            else:
+                self._allowed += 1
+        if retry_after:
+            raise RateLimited(max(1, math.ceil(retry_after)))
+
+    def reset(self) -> None:
+        self._get_store().clear()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "backend": self.backend,
+                "allowed": self._allowed,
+                "rejected": self._rejected,
+            }
@@ -2,13 +2,14 @@ from datetime import datetime, timedelta, timezone
 import os
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
-from fastapi import Depends, HTTPException, Request, status
-from sqlmodel import Session
+from fastapi import HTTPException, Request, status
 
-from src.core.db_global import get_session
+from src.core.account_cache import account_cache
+from src.core.db_global import get_async_db, get_db
+from src.core.hash_pool import HashPool
 from src.database.account_repository import AccountsRepository
+from src.database.async_account_repository import AsyncAccountsRepository
 from src.models.account import Account
 
 
@@ -21,7 +22,7 @@ class Security:
     """
 
     def __init__(self) -> None:
-        self._pwd = CryptContext(schemes=["argon2"], deprecated="auto")
+        self.hash_pool = HashPool()
         self._secret_key = os.getenv("SECRET_KEY", "my_secret_key")
         self._algorithm = os.getenv("JWT_ALGORITHM", "HS256")
         self._access_token_expire_minutes = int(
@@ -29,10 +30,20 @@ class Security:
         )
 
     def get_password_hash(self, password: str) -> str:
-        return self._pwd.hash(password)
+        """Hash on the dedicated Argon2 pool; raises HashPoolBusy when it is saturated."""
+        return self.hash_pool.hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return self._pwd.verify(plain_password, hashed_password)
+        """Verify on the dedicated Argon2 pool; raises HashPoolBusy when it is saturated."""
+        return self.hash_pool.verify(plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """Like `get_password_hash`, awaiting the pool instead of blocking a thread."""
+        return await self.hash_pool.hash_async(password)
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Like `verify_password`, awaiting the pool instead of blocking a thread."""
+        return await self.hash_pool.verify_async(plain_password, hashed_password)
 
     def create_access_token(self, sub: str, extra: dict = None, minutes: int = None) -> str:
         now = datetime.now(timezone.utc)
@@ -42,13 +53,7 @@ class Security:
             payload.update(extra)
         return jwt.encode(payload, self._secret_key, algorithm=self._algorithm)
 
-    def get_current_contact(self, request: Request, session: Session = Depends(get_session)) -> Account:
-        """FastAPI dependency: read token from cookie and return Account.
-
-        This method expects to be used as a dependency: FastAPI will provide
-        the `session` argument using Depends(get_session) when used via the
-        module-level wrapper below.
-        """
+    def _account_id_from_request(self, request: Request):
         token = request.cookies.get("access_token")
         if not token:
             raise HTTPException(
@@ -75,22 +80,49 @@ class Security:
             )
 
         try:
-            cid = int(contact_id)
+            return int(contact_id)
         except Exception:
-            cid = contact_id
-
-        repo = AccountsRepository(session)
-        contact = repo.get_by_id(cid)
+            return contact_id
 
+    @staticmethod
+    def _ensure_active(contact: Account) -> Account:
         if not contact or not getattr(contact, "is_active", True):
             raise HTTPException(
                 status_code=status.HTTP_303_SEE_OTHER,
                 detail="contact inactive or not found",
                 headers={"Location": "/pages/account/login"},
             )
+        return contact
+
+    def get_current_contact(self, request: Request) -> Account:
+        """FastAPI dependency: read token from cookie and return Account.
+
+        The lookup runs in its own short read session, closed before the route
+        body starts, so a request never holds a pooled connection for it while
+        its own (write) session needs another one.
+        """
+        cid = self._account_id_from_request(request)
+        cached = account_cache.get(cid)
+        if cached is not None:
+            return cached
+
+        with get_db().get_read_session() as session:
+            contact = self._ensure_active(AccountsRepository(session).get_by_id(cid))
+        account_cache.put(contact)
+        return contact
+
+    async def get_current_contact_async(self, request: Request) -> Account:
+        """Async variant of `get_current_contact` for routes served in DB_MODE=async."""
+        cid = self._account_id_from_request(request)
+        cached = account_cache.get(cid)
+        if cached is not None:
+            return cached
 
+        async with get_async_db().get_read_session() as session:
+            contact = self._ensure_active(await AsyncAccountsRepository(session).get_by_id(cid))
+        account_cache.put(contact)
         return contact
 
-    def auth_required(self, current_contact: Account = Depends(get_session)) -> None:
+    def auth_required(self) -> None:
         return None
 
@@ -0,0 +1,65 @@
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Hashable, Optional, Tuple
+
+
+class StatsCache:
+    """In-process LRU cache of per-owner contact statistics.
+
+    Keys carry the owner's change counter (`OwnerVersion.version`) and the
+    current date, so any contact write - from any worker, since the counter
+    lives in the database - and the daily shift of everyone's age both make
+    old entries unreachable without explicit invalidation. Stale entries
+    simply age out of the LRU.
+
+    Configured from the environment:
+        CONTACT_STATS_CACHE_SIZE  max entries (default: 256, 0 disables the cache)
+    """
+
+    def __init__(self, max_size: int = None) -> None:
+        self.max_size = max_size if max_size is not None else int(os.getenv("CONTACT_STATS_CACHE_SIZE", "256"))
+        self._entries: "OrderedDict[Tuple, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(owner_id: int, version: int, *params: Hashable) -> Tuple:
+        return (owner_id, version, date.today(), *params)
+
+    def get(self, key: Tuple) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple, stats: dict) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = stats
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+stats_cache = StatsCache()
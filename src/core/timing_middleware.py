@@ -0,0 +1,56 @@
+import os
+import random
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src import app_logging
+from src.core import metrics
+
+
+class TimingMiddleware:
+    """Pure ASGI request timing: X-Process-Time header, metrics and sampled access logs.
+
+    Unlike `BaseHTTPMiddleware` this wraps `send` instead of the response
+    object, so it adds no extra task or memory stream per request and leaves
+    streaming bodies untouched. X-Process-Time is the time to the response
+    headers; the latency histogram covers the full body.
+
+    LOG_SAMPLE_RATE (0..1, default 1) controls the share of requests that get
+    an access log line; 5xx responses are always logged.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = None) -> None:
+        self.app = app
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.getenv("LOG_SAMPLE_RATE", "1"))
+        self.logger = app_logging.get_logger("main logger: ")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        start = time.perf_counter_ns()
+        status_code = 500
+        metrics.http_requests_in_progress.inc(method=method)
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = (time.perf_counter_ns() - start) / 1e9
+                MutableHeaders(scope=message).append("X-Process-Time", f"{elapsed:.4f} sec")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = (time.perf_counter_ns() - start) / 1e9
+            route = metrics.route_template(scope)
+            metrics.http_requests_in_progress.dec(method=method)
+            metrics.http_requests_total.inc(method=method, route=route, status=status_code)
+            metrics.http_request_duration_seconds.observe(elapsed, method=method, route=route)
+            if status_code >= 500 or (self.sample_rate > 0 and random.random() < self.sample_rate):
+                self.logger.info("%s %s took %.4f sec", method, scope["path"], elapsed)
@@ -1,7 +1,13 @@
 from typing import List, Optional
+from sqlalchemy import event, insert
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
+from src.core.account_cache import account_cache
+from src.database import unique_insert
 from src.models.account import Account
 
+UNIQUE_FIELDS = ("username", "email")
+
 class AccountsRepository:
     def __init__(self, session: Session):
         self.session = session
@@ -11,6 +17,29 @@ class AccountsRepository:
         stmt = select(self.model).where((self.model.email == email_norm) | (self.model.username == username))
         return self.session.exec(stmt).first() is not None
 
+    def find_conflict(self, username: str, email_norm: str) -> Optional[str]:
+        """Which of username / email is already taken, or None - cheap enough to run before hashing."""
+        values = {"username": username, "email": email_norm}
+        row = self.session.exec(unique_insert.conflict_probe(self.model, values, UNIQUE_FIELDS)).first()
+        return unique_insert.conflicting_field(row, UNIQUE_FIELDS)
+
+    def insert_account(self, username: str, email: str, hashed_password: str) -> Optional[str]:
+        """Insert an account in one statement; returns None, or the conflicting field if one was taken meanwhile."""
+        values = Account(username=username, email=email, hashed_password=hashed_password).model_dump(exclude={"id"})
+        stmt = unique_insert.insert_statement(self.session.get_bind().dialect.name, self.model, values)
+        if stmt is not None:
+            inserted = self.session.exec(stmt).first() is not None
+        else:
+            try:
+                with self.session.begin_nested():
+                    self.session.exec(insert(self.model).values(**values))
+                inserted = True
+            except IntegrityError:
+                inserted = False
+        if not inserted:
+            return self.find_conflict(username, email) or unique_insert.UNKNOWN_FIELD
+        return None
+
     def add(self, account: Account) -> Account:
         self.session.add(account)
         self.session.flush()
@@ -21,11 +50,19 @@ class AccountsRepository:
         acc = Account(username=username, email=email, hashed_password=hashed_password)
         return self.add(acc)
 
+    def _invalidate_cached(self, account_id: int) -> None:
+        # drop it now, and again once committed so a concurrent reader can't re-cache the old row
+        account_cache.invalidate(account_id)
+        event.listen(
+            self.session, "after_commit", lambda _: account_cache.invalidate(account_id), once=True
+        )
+
     def delete_by_id(self, obj_id: int) -> bool:
         acc = self.session.get(Account, obj_id)
         if not acc:
             return False
         self.session.delete(acc)
+        self._invalidate_cached(obj_id)
         return True
 
     def delete_by_username(self, username: str) -> bool:
@@ -33,6 +70,16 @@ class AccountsRepository:
         if not acc:
             return False
         self.session.delete(acc)
+        self._invalidate_cached(acc.id)
+        return True
+
+    def set_active(self, obj_id: int, is_active: bool) -> bool:
+        acc = self.session.get(Account, obj_id)
+        if not acc:
+            return False
+        acc.is_active = is_active
+        self.session.add(acc)
+        self._invalidate_cached(obj_id)
         return True
 
     def get_all(self) -> List[Account]:
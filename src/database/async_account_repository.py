@@ -0,0 +1,44 @@
+from typing import Optional
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from src.database import unique_insert
+from src.database.account_repository import UNIQUE_FIELDS
+from src.models.account import Account
+
+class AsyncAccountsRepository:
+    """Async twin of the parts of `AccountsRepository` used when DB_MODE=async (signup, login, auth)."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.model = Account
+
+    async def find_conflict(self, username: str, email_norm: str) -> Optional[str]:
+        values = {"username": username, "email": email_norm}
+        row = (await self.session.exec(unique_insert.conflict_probe(self.model, values, UNIQUE_FIELDS))).first()
+        return unique_insert.conflicting_field(row, UNIQUE_FIELDS)
+
+    async def insert_account(self, username: str, email: str, hashed_password: str) -> Optional[str]:
+        values = Account(username=username, email=email, hashed_password=hashed_password).model_dump(exclude={"id"})
+        stmt = unique_insert.insert_statement(self.session.bind.dialect.name, self.model, values)
+        if stmt is not None:
+            inserted = (await self.session.exec(stmt)).first() is not None
+        else:
+            try:
+                async with self.session.begin_nested():
+                    await self.session.exec(insert(self.model).values(**values))
+                inserted = True
+            except IntegrityError:
+                inserted = False
+        if not inserted:
+            return await self.find_conflict(username, email) or unique_insert.UNKNOWN_FIELD
+        return None
+
+    async def get_by_id(self, obj_id: int) -> Optional[Account]:
+        return await self.session.get(Account, obj_id)
+
+    async def get_by_username(self, username: str) -> Optional[Account]:
+        return (await self.session.exec(
+            select(Account).where(Account.username == username)
+        )).first()
@@ -0,0 +1,111 @@
+from typing import AsyncIterator, List, Optional
+
+from sqlalchemy import Row, delete, insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.database import unique_insert
+from src.database.contact_repository import (
+    LISTING_COLUMNS, UNIQUE_FIELDS, stamp_statement,
+)
+from src.database.owner_version_repository import bump_statement, increment_statement
+from src.models.contact import Contact
+from src.models.owner_version import OwnerVersion
+
+
+class AsyncContactRepository:
+    """Async twin of `ContactRepository`, used when DB_MODE=async."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.model = Contact
+
+    async def _bump_version(self, owner_id: int) -> int:
+        stmt = bump_statement(self.session.bind.dialect.name, owner_id)
+        if stmt is not None:
+            return (await self.session.exec(stmt)).scalar_one()
+        result = await self.session.exec(increment_statement(owner_id))
+        if result.rowcount == 0:
+            self.session.add(OwnerVersion(owner_id=owner_id, version=1))
+            await self.session.flush()
+            return 1
+        return (await self.session.exec(select(OwnerVersion.version).where(OwnerVersion.owner_id == owner_id))).one()
+
+    async def _record_inserts(self, owner_id: int) -> None:
+        await self.session.exec(stamp_statement(owner_id, await self._bump_version(owner_id)))
+
+    async def get_version(self, owner_id: int) -> Optional[OwnerVersion]:
+        return await self.session.get(OwnerVersion, owner_id)
+
+    async def find_conflict(self, values: dict) -> Optional[str]:
+        row = (await self.session.exec(unique_insert.conflict_probe(self.model, values, UNIQUE_FIELDS))).first()
+        return unique_insert.conflicting_field(row, UNIQUE_FIELDS)
+
+    async def insert_contact(self, obj: Contact) -> Optional[str]:
+        values = obj.model_dump()
+        stmt = unique_insert.insert_statement(self.session.bind.dialect.name, self.model, values)
+        if stmt is not None:
+            inserted = (await self.session.exec(stmt)).first() is not None
+        else:
+            try:
+                async with self.session.begin_nested():
+                    await self.session.exec(insert(self.model).values(**values))
+                inserted = True
+            except IntegrityError:
+                inserted = False
+        if not inserted:
+            return await self.find_conflict(values) or unique_insert.UNKNOWN_FIELD
+        await self._record_inserts(obj.owner_id)
+        return None
+
+    async def get_by_id(self, obj_id: int) -> Optional[Contact]:
+        return await self.session.get(self.model, obj_id)
+
+    async def delete_by_id_and_owner(self, contact_id: int, owner_id: int) -> bool:
+        stmt = (
+            delete(self.model)
+            .where(self.model.id == contact_id, self.model.owner_id == owner_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.exec(stmt)
+        if not result.rowcount:
+            return False
+        await self._bump_version(owner_id)
+        return True
+
+    def _scoped(self, stmt, owner_id: Optional[int]):
+        if owner_id is None:
+            return stmt
+        return stmt.where(self.model.owner_id == owner_id)
+
+    async def get_rows(
+        self,
+        owner_id: Optional[int] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        columns = (self.model.id, self.model.name, self.model.email, self.model.date_of_birth)
+        stmt = self._scoped(select(*columns), owner_id).order_by(self.model.id)
+        if after_id is not None:
+            stmt = stmt.where(self.model.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [row._asdict() for row in await self.session.exec(stmt)]
+
+    async def stream_rows(
+        self,
+        owner_id: int,
+        *conditions,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[Row]:
+        stmt = select(*LISTING_COLUMNS).where(self.model.owner_id == owner_id, *conditions).order_by(self.model.id)
+        if after_id is not None:
+            stmt = stmt.where(self.model.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self.session.stream(stmt.execution_options(yield_per=chunk_size))
+        async for row in result:
+            yield row
@@ -0,0 +1,56 @@
+import os
+from typing import List
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.metrics import instrument_engine
+from src.database import migrations
+from src.database.db_config import DBConfig, async_url
+from src.database.read_only import ReadOnlySession, install_read_only_reset
+
+class AsyncDBCore:
+    _instance: bool = False
+
+    def __init__(self, db_url: str = None) -> None:
+        if AsyncDBCore._instance:
+            raise ValueError("AsyncDBCore is a singleton class. Use the existing instance.")
+        ## same database as the sync DBCore (signup/login still use it) unless overridden
+        self.config = DBConfig(db_url or os.getenv("ASYNC_DB_URL") or async_url(DBConfig().url))
+
+        ## create engine - same pool settings and SQLite profile as the sync DBCore
+        engine_kwargs = self.config.engine_kwargs()
+        engine_kwargs.pop("connect_args", None)
+        self._engine = create_async_engine(self.config.url, **engine_kwargs)
+        self.config.install_pragmas(self._engine.sync_engine)
+        install_read_only_reset(self._engine.sync_engine)
+        instrument_engine(self._engine.sync_engine)
+        ## create session factory
+        self._sessionMaker = async_sessionmaker(
+            bind=self._engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        self._readSessionMaker = async_sessionmaker(
+            bind=self._engine,
+            class_=AsyncSession,
+            sync_session_class=ReadOnlySession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+        AsyncDBCore._instance = True
+
+    async def migrate(self) -> List[int]:
+        async with self._engine.begin() as conn:
+            return await conn.run_sync(migrations.migrate)
+
+    async def dispose(self) -> None:
+        await self._engine.dispose()
+        AsyncDBCore._instance = False
+
+    def get_session(self) -> AsyncSession:
+        return self._sessionMaker()
+
+    def get_read_session(self) -> AsyncSession:
+        return self._readSessionMaker()
@@ -0,0 +1,140 @@
+import threading
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import bindparam, func
+from sqlmodel import select
+
+from src.models.contact import Contact
+
+SORT_COLUMNS = {
+    "id": Contact.id,
+    "name": Contact.name,
+    "email": Contact.email,
+    "date_of_birth": Contact.date_of_birth,
+    "created_at": Contact.created_at,
+}
+
+## (shape) -> (page statement, count statement); shapes are few, so this stays small
+_STATEMENT_CACHE: Dict[tuple, tuple] = {}
+_STATEMENT_CACHE_LOCK = threading.Lock()
+
+
+def _like_prefix(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+class ContactQuery:
+    """A combinable contact filter: predicates + sort + limit/offset or keyset paging.
+
+    Statements are built from bind parameters only, keyed by the query's
+    *shape* (which predicates are present, sort, paging mode). Repeated
+    queries of the same shape reuse the same statement objects, so
+    SQLAlchemy's compiled cache is hit without rebuilding the construct.
+    """
+
+    def __init__(
+        self,
+        owner_id: int,
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None,
+        name_prefix: Optional[str] = None,
+        email_prefix: Optional[str] = None,
+        created_from: Optional[date] = None,
+        created_to: Optional[date] = None,
+        is_active: Optional[bool] = None,
+        sort: str = "id",
+        descending: bool = False,
+        limit: int = 50,
+        offset: int = 0,
+        after_id: Optional[int] = None,
+    ) -> None:
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"cannot sort by {sort!r}")
+        if after_id is not None and (sort != "id" or offset):
+            raise ValueError("after_id paging requires sort=id and no offset")
+        if min_age is not None and max_age is not None and min_age > max_age:
+            raise ValueError("min_age must not exceed max_age")
+
+        today = date.today()
+        self.params = {"owner_id": owner_id, "limit": limit, "offset": offset}
+        if min_age is not None:
+            self.params["dob_max"] = today - relativedelta(years=min_age)
+        if max_age is not None:
+            self.params["dob_min"] = today - relativedelta(years=max_age)
+        if name_prefix:
+            self.params["name_like"] = _like_prefix(name_prefix)
+        if email_prefix:
+            self.params["email_like"] = _like_prefix(email_prefix.strip().casefold())
+        if created_from is not None:
+            self.params["created_from"] = created_from
+        if created_to is not None:
+            self.params["created_to"] = created_to
+        if is_active is not None:
+            self.params["is_active"] = is_active
+        if after_id is not None:
+            self.params["after_id"] = after_id
+
+        self.sort = sort
+        self.descending = descending
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(sorted(self.params)), self.sort, self.descending
+
+    def _count_params(self) -> dict:
+        return {k: v for k, v in self.params.items() if k not in ("limit", "offset", "after_id")}
+
+    def _build(self) -> tuple:
+        c = Contact
+        where = [c.owner_id == bindparam("owner_id")]
+        if "dob_max" in self.params:
+            where.append(c.date_of_birth <= bindparam("dob_max"))
+        if "dob_min" in self.params:
+            where.append(c.date_of_birth >= bindparam("dob_min"))
+        if "name_like" in self.params:
+            where.append(c.name.like(bindparam("name_like"), escape="\\"))
+        if "email_like" in self.params:
+            where.append(c.email.like(bindparam("email_like"), escape="\\"))
+        if "created_from" in self.params:
+            where.append(c.created_at >= bindparam("created_from"))
+        if "created_to" in self.params:
+            where.append(c.created_at <= bindparam("created_to"))
+        if "is_active" in self.params:
+            where.append(c.is_active == bindparam("is_active"))
+
+        count_stmt = select(func.count()).select_from(c).where(*where)
+
+        page_where = list(where)
+        if "after_id" in self.params:
+            if self.descending:
+                page_where.append(c.id < bindparam("after_id"))
+            else:
+                page_where.append(c.id > bindparam("after_id"))
+
+        sort_col = SORT_COLUMNS[self.sort]
+        order = [sort_col.desc() if self.descending else sort_col.asc()]
+        if self.sort != "id":
+            order.append(c.id.desc() if self.descending else c.id.asc())  # stable tiebreak
+        page_stmt = (
+            select(c).where(*page_where).order_by(*order)
+            .limit(bindparam("limit")).offset(bindparam("offset"))
+        )
+        return page_stmt, count_stmt
+
+    def statements(self) -> tuple:
+        shape = self.shape
+        cached = _STATEMENT_CACHE.get(shape)
+        if cached is None:
+            with _STATEMENT_CACHE_LOCK:
+                cached = _STATEMENT_CACHE.setdefault(shape, self._build())
+        return cached
+
+    def execute(self, session) -> Tuple[list, int]:
+        """Return (page of Contact objects, total matching count)."""
+        page_stmt, count_stmt = self.statements()
+        items = list(session.exec(page_stmt, params=self.params).all())
+        total = session.exec(count_stmt, params=self._count_params()).one()
+        return items, total
@@ -1,67 +1,317 @@
-from typing import List
-from datetime import date
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from datetime import date, timedelta
 
 from dateutil.relativedelta import relativedelta
+from sqlalchemy import Row, case, delete, func, insert, or_, update
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session,  select
 
+from src.database import contact_search, unique_insert
+from src.database.contact_query import ContactQuery, _like_prefix
+from src.database.owner_version_repository import OwnerVersionRepository
 from src.models.contact import Contact
 
 
+LISTING_COLUMNS = (Contact.id, Contact.name, Contact.email, Contact.date_of_birth)
+EXPORT_COLUMNS = LISTING_COLUMNS + (Contact.is_active, Contact.created_at)
+UNIQUE_FIELDS = ("id", "email")
+
+
+def stamp_statement(owner_id: int, version: int):
+    """Stamp the owner's contacts inserted by this transaction (still unstamped) with the version it bumped to."""
+    return (
+        update(Contact)
+        .where(Contact.owner_id == owner_id, Contact.change_version.is_(None))
+        .values(change_version=version)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def age_above_condition(age: int):
+    cutoff = date.today() - relativedelta(years=age)
+    return Contact.date_of_birth <= cutoff
+
+
+def age_between_condition(min_age: int, max_age: int):
+    today = date.today()
+    oldest_birth = today - relativedelta(years=max_age)
+    youngest_birth = today - relativedelta(years=min_age)
+    return (Contact.date_of_birth >= oldest_birth) & (Contact.date_of_birth <= youngest_birth)
+
+
 class ContactRepository:
     def __init__(self, session: Session):
         self.session = session
         self.model = Contact
+        self.versions = OwnerVersionRepository(session)
 
     def check_id_and_email(self, id_1: int, email_norm: str) -> bool:
         stmt = select(self.model).where((self.model.id == id_1) | (self.model.email == email_norm))
         return self.session.exec(stmt).first() is not None
 
+    def find_conflict(self, values: dict) -> Optional[str]:
+        """Which of id / email is already taken by a stored contact, or None."""
+        row = self.session.exec(unique_insert.conflict_probe(self.model, values, UNIQUE_FIELDS)).first()
+        return unique_insert.conflicting_field(row, UNIQUE_FIELDS)
+
+    def insert_contact(self, obj: Contact) -> Optional[str]:
+        """Insert `obj` in one statement unless its id or email is taken.
+
+        Returns None on success, otherwise the name of the conflicting field.
+        """
+        values = obj.model_dump()
+        stmt = unique_insert.insert_statement(self.session.get_bind().dialect.name, self.model, values)
+        if stmt is not None:
+            inserted = self.session.exec(stmt).first() is not None
+        else:
+            try:
+                with self.session.begin_nested():
+                    self.session.exec(insert(self.model).values(**values))
+                inserted = True
+            except IntegrityError:
+                inserted = False
+        if not inserted:
+            return self.find_conflict(values) or unique_insert.UNKNOWN_FIELD
+        self._record_inserts(obj.owner_id)
+        return None
+
     def add(self, obj: Contact) -> Contact:
         self.session.add(obj)
         self.session.flush()
+        self._record_inserts(obj.owner_id)
         self.session.refresh(obj)
         return obj
 
+    def _record_inserts(self, owner_id: int) -> None:
+        self.session.exec(stamp_statement(owner_id, self.versions.bump(owner_id)))
+
+    def existing_ids(self, ids: Iterable[int]) -> Set[int]:
+        ids = list(ids)
+        if not ids:
+            return set()
+        stmt = select(self.model.id).where(self.model.id.in_(ids))
+        return set(self.session.exec(stmt).all())
+
+    def existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        emails = list(emails)
+        if not emails:
+            return set()
+        stmt = select(self.model.email).where(self.model.email.in_(emails))
+        return set(self.session.exec(stmt).all())
+
+    def bulk_insert(self, rows: List[dict]) -> int:
+        """Insert plain column dicts in one executemany, bypassing the ORM unit of work."""
+        if not rows:
+            return 0
+        self.session.exec(insert(self.model), params=rows)
+        for owner_id in {row["owner_id"] for row in rows}:
+            self._record_inserts(owner_id)
+        return len(rows)
+
     def get_by_id(self, obj_id: int) -> None:
         return self.session.get(self.model, obj_id)
 
     def delete_by_id_and_owner(self, contact_id: int, owner_id: int) -> bool:
-        obj = self.session.get(self.model, contact_id)
-        if not obj:
-            return False
+        return self.delete_many(owner_id, ids=[contact_id]) == 1
 
-        if obj.owner_id != owner_id:
-            return False
+    def delete_many(
+        self,
+        owner_id: int,
+        ids: Optional[Sequence[int]] = None,
+        id_from: Optional[int] = None,
+        id_to: Optional[int] = None,
+        created_before: Optional[date] = None,
+    ) -> int:
+        """Delete the owner's contacts matching every given criterion in one statement.
 
-        self.session.delete(obj)
-        self.session.commit()
-        return True
+        Nothing is loaded into the session; returns the number of rows deleted.
+        The owner version is bumped once, and only if something was deleted.
+        """
+        conditions = []
+        if ids is not None:
+            if not ids:
+                return 0
+            conditions.append(self.model.id.in_(ids))
+        if id_from is not None and id_to is not None and id_from > id_to:
+            raise ValueError("id_from must not be greater than id_to")
+        if id_from is not None:
+            conditions.append(self.model.id >= id_from)
+        if id_to is not None:
+            conditions.append(self.model.id <= id_to)
+        if created_before is not None:
+            conditions.append(self.model.created_at < created_before)
+        if not conditions:
+            raise ValueError("Give ids, an id range or an age cut-off; refusing to delete everything")
+
+        stmt = (
+            delete(self.model)
+            .where(self.model.owner_id == owner_id, *conditions)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = self.session.exec(stmt).rowcount
+        if deleted:
+            self.versions.bump(owner_id)
+        return deleted
 
     def delete_by_id(self, obj_id: int) -> bool:
         db_obj = self.session.get(self.model, obj_id)
         if not db_obj:
             return False
         self.session.delete(db_obj)
+        self.versions.bump(db_obj.owner_id)
         return True
 
-    def get_all(self) -> List[Contact]:
-        return list(self.session.exec(select(self.model)).all())
+    def _scoped(self, stmt, owner_id: Optional[int]):
+        if owner_id is None:
+            return stmt
+        return stmt.where(self.model.owner_id == owner_id)
 
-    def get_contacts_above_age(self, age: int) -> List[Contact]:
-        today = date.today()
-        cutoff = today - relativedelta(years=age)
-        stmt = select(self.model).where(self.model.date_of_birth <= cutoff)
+    def get_all(self, owner_id: int) -> List[Contact]:
+        stmt = select(self.model).where(self.model.owner_id == owner_id).order_by(self.model.id)
         return list(self.session.exec(stmt).all())
 
-    def get_contacts_between_age(
-        self, min_age: int, max_age: int
-    ) -> List[Contact]:
-        today = date.today()
-        oldest_birth = today - relativedelta(years=max_age)
+    def get_rows(
+        self,
+        owner_id: Optional[int] = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        with_owner: bool = False,
+    ) -> List[dict]:
+        """Listing columns as plain dicts, read as Core rows (no ORM hydration or identity map)."""
+        columns = LISTING_COLUMNS + ((self.model.owner_id,) if with_owner else ())
+        stmt = self._scoped(select(*columns), owner_id).order_by(self.model.id)
+        if after_id is not None:
+            stmt = stmt.where(self.model.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return [row._asdict() for row in self.session.exec(stmt)]
+
+    def iter_row_chunks(self, chunk_size: int = 1000, owner_id: Optional[int] = None) -> Iterator[List[dict]]:
+        """Walk the (owner's) contacts one keyset page of plain dict rows at a time."""
+        after_id = None
+        while True:
+            chunk = self.get_rows(owner_id=owner_id, after_id=after_id, limit=chunk_size)
+            if not chunk:
+                return
+            yield chunk
+            after_id = chunk[-1]["id"]
+
+    def stream_rows(
+        self,
+        owner_id: int,
+        *conditions,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[Row]:
+        """Listing rows (by id) from one cursor, fetched `chunk_size` at a time, for streamed pages."""
+        stmt = select(*LISTING_COLUMNS).where(self.model.owner_id == owner_id, *conditions).order_by(self.model.id)
+        if after_id is not None:
+            stmt = stmt.where(self.model.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        yield from self.session.exec(stmt.execution_options(yield_per=chunk_size))
 
-        youngest_birth = today - relativedelta(years=min_age)
+    def iter_export(
+        self,
+        owner_id: int,
+        since_version: Optional[int] = None,
+        since_created: Optional[date] = None,
+        until_version: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> Iterator[List[tuple]]:
+        """Stream the owner's contacts (EXPORT_COLUMNS, by id) from one cursor, `chunk_size` rows at a time.
 
-        stmt = select(self.model).where(
-            (self.model.date_of_birth >= oldest_birth) & (self.model.date_of_birth <= youngest_birth)
+        `since_version` restricts it to rows inserted after a previous export
+        (by their `change_version` stamp; ids are client-chosen and say nothing
+        about insert order); `until_version` pins the upper end so a concurrent
+        insert can't be half in, half out of a delta. `since_created` is a
+        coarser, day-granular filter.
+        """
+        stmt = select(*EXPORT_COLUMNS).where(self.model.owner_id == owner_id).order_by(self.model.id)
+        if since_version is not None:
+            stmt = stmt.where(self.model.change_version > since_version)
+        if since_created is not None:
+            stmt = stmt.where(self.model.created_at >= since_created)
+        if until_version is not None:
+            ## `+ 0` keeps the bound a plain filter: a full export must walk (owner_id, id),
+            ## not the change_version index plus a sort of every row
+            stmt = stmt.where(self.model.change_version + 0 <= until_version)
+        result = self.session.exec(stmt.execution_options(yield_per=chunk_size))
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+    def query(self, spec: ContactQuery) -> Tuple[List[Contact], int]:
+        """Run a composed filter; returns the requested page and the total match count."""
+        return spec.execute(self.session)
+
+    def search(self, query: str, owner_id: int, limit: int = 20, offset: int = 0) -> List[dict]:
+        """Prefix search over name/email, best matches first.
+
+        Uses the FTS5 index on SQLite; other databases fall back to LIKE prefixes.
+        """
+        terms = contact_search.search_terms(query)
+        if not terms:
+            return []
+        if contact_search.is_supported(self.session.get_bind()):
+            params = {"match": contact_search.match_expression(terms, owner_id), "limit": limit, "offset": offset}
+            return [row._asdict() for row in self.session.exec(contact_search.SEARCH_SQL, params=params)]
+
+        conditions = []
+        for term in terms:
+            pattern = _like_prefix(term)
+            conditions.append(or_(self.model.name.ilike(pattern, escape="\\"), self.model.email.like(pattern, escape="\\")))
+        stmt = (
+            select(*LISTING_COLUMNS).where(self.model.owner_id == owner_id, *conditions)
+            .order_by(self.model.name, self.model.id).limit(limit).offset(offset)
         )
+        return [row._asdict() for row in self.session.exec(stmt)]
+
+    def get_stats(self, owner_id: int, bucket_width: int = 10, days: int = 30) -> dict:
+        """Totals, age histogram and per-day creation counts for one owner.
+
+        Each part is one aggregate over a covering (owner_id, ...) index. The
+        histogram groups by date_of_birth in SQL (at most a few tens of
+        thousands of groups) and only assigns those groups to age buckets here.
+        """
+        today = date.today()
+        owned = self.model.owner_id == owner_id
+
+        total, active = self.session.exec(
+            select(func.count(), func.coalesce(func.sum(case((self.model.is_active, 1), else_=0)), 0)).where(owned)
+        ).one()
+
+        buckets = {}
+        for dob, count in self.session.exec(
+            select(self.model.date_of_birth, func.count()).where(owned).group_by(self.model.date_of_birth)
+        ):
+            age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+            if age >= 0:
+                start = age - age % bucket_width
+                buckets[start] = buckets.get(start, 0) + count
+
+        since = today - timedelta(days=days - 1)
+        per_day = self.session.exec(
+            select(self.model.created_at, func.count())
+            .where(owned, self.model.created_at >= since)
+            .group_by(self.model.created_at)
+            .order_by(self.model.created_at)
+        ).all()
+
+        return {
+            "total": total,
+            "active": active,
+            "inactive": total - active,
+            "age_histogram": [
+                {"from": start, "to": start + bucket_width - 1, "count": buckets[start]} for start in sorted(buckets)
+            ],
+            "created_per_day": [{"date": day.isoformat(), "count": count} for day, count in per_day],
+        }
+
+    def get_contacts_above_age(self, age: int, owner_id: int) -> List[Contact]:
+        stmt = select(self.model).where(self.model.owner_id == owner_id, age_above_condition(age))
+        return list(self.session.exec(stmt).all())
+
+    def get_contacts_between_age(self, min_age: int, max_age: int, owner_id: int) -> List[Contact]:
+        stmt = select(self.model).where(self.model.owner_id == owner_id, age_between_condition(min_age, max_age))
         return list(self.session.exec(stmt).all())
@@ -0,0 +1,103 @@
+"""SQLite FTS5 index over contact name/email.
+
+`contact_fts` is an external-content FTS5 table over `contact` (no second
+copy of the text), kept in sync by insert/update/delete triggers. `owner_id`
+is indexed as a column too, so owner scoping is part of the MATCH and the
+index intersects it with the search terms instead of filtering afterwards.
+
+Rebuild the index for a database that already had contacts:
+
+    python -m src.database.contact_search rebuild
+"""
+import re
+import sys
+from typing import List, Union
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+FTS_TABLE = "contact_fts"
+
+FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, email, owner_id,
+        content='contact', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS contact_fts_ai AFTER INSERT ON contact BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, email, owner_id) VALUES (new.id, new.name, new.email, new.owner_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS contact_fts_ad AFTER DELETE ON contact BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, email, owner_id)
+        VALUES ('delete', old.id, old.name, old.email, old.owner_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS contact_fts_au AFTER UPDATE OF name, email, owner_id ON contact BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, email, owner_id)
+        VALUES ('delete', old.id, old.name, old.email, old.owner_id);
+        INSERT INTO {FTS_TABLE}(rowid, name, email, owner_id) VALUES (new.id, new.name, new.email, new.owner_id);
+    END""",
+]
+
+## weights for bm25(): name matters most, email less, owner_id is only a filter
+SEARCH_SQL = text(f"""
+    SELECT c.id, c.name, c.email, c.date_of_birth, bm25({FTS_TABLE}, 10.0, 5.0, 0.0) AS rank
+    FROM {FTS_TABLE} JOIN contact AS c ON c.id = {FTS_TABLE}.rowid
+    WHERE {FTS_TABLE} MATCH :match
+    ORDER BY rank
+    LIMIT :limit OFFSET :offset
+""")
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def is_supported(bind: Union[Engine, Connection]) -> bool:
+    return bind.dialect.name == "sqlite"
+
+
+def create_fts(conn: Connection) -> None:
+    """Create the FTS table and triggers; a freshly created index is filled from `contact`."""
+    if not is_supported(conn):
+        return
+    existed = inspect(conn).has_table(FTS_TABLE)
+    for ddl in FTS_DDL:
+        conn.exec_driver_sql(ddl)
+    if not existed:
+        conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def rebuild(conn: Connection) -> None:
+    conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def search_terms(query: str) -> List[str]:
+    return _TOKEN.findall(query.casefold())
+
+
+def match_expression(terms: List[str], owner_id: int) -> str:
+    """FTS5 query: every term as a prefix over name/email, restricted to the owner."""
+    prefixes = " ".join(f'"{term}"*' for term in terms)
+    return f'owner_id:"{int(owner_id)}" AND {{name email}}: ({prefixes})'
+
+
+def main(argv: List[str]) -> int:
+    if argv[1:] != ["rebuild"]:
+        print(__doc__)
+        return 2
+    from src.database.db_config import DBConfig
+    from sqlmodel import create_engine
+
+    config = DBConfig()
+    engine = create_engine(config.url, **config.engine_kwargs())
+    try:
+        with engine.begin() as conn:
+            create_fts(conn)
+            rebuild(conn)
+    finally:
+        engine.dispose()
+    print(f"{FTS_TABLE} rebuilt for {config.url}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
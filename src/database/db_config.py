@@ -0,0 +1,110 @@
+import os
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+DB_URL = "sqlite:///ourDB.db"
+
+## async driver for each sync backend, used when ASYNC_DB_URL is not set
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+## PRAGMAs applied to every new SQLite connection under SQLITE_PROFILE=performance.
+## Each one can be overridden with SQLITE_<NAME>, e.g. SQLITE_MMAP_SIZE=0.
+PERFORMANCE_PRAGMAS = {
+    "journal_mode": "WAL",          # readers no longer block on the writer
+    "synchronous": "NORMAL",        # fsync at checkpoints only; safe with WAL
+    "mmap_size": "268435456",       # 256 MiB memory-mapped reads
+    "cache_size": "-65536",         # 64 MiB page cache per connection
+    "busy_timeout": "5000",         # wait for a lock instead of failing with "database is locked"
+    "temp_store": "MEMORY",
+}
+
+
+def async_url(url: str) -> str:
+    """`url` with the backend's async driver swapped in (already-async URLs are returned as is)."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None or parsed.get_driver_name() in ("aiosqlite", "asyncpg"):
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+class DBConfig:
+    """Engine settings for `DBCore` / `AsyncDBCore`, read from the environment.
+
+        DATABASE_URL       sync SQLAlchemy URL (default: sqlite:///ourDB.db); Postgres URLs work too
+        ASYNC_DB_URL       AsyncDBCore URL override (default: DATABASE_URL with its async driver)
+        DB_POOL_SIZE       connections kept in the pool (default: 5)
+        DB_MAX_OVERFLOW    extra connections allowed above the pool size (default: 10)
+        DB_POOL_TIMEOUT    seconds to wait for a pooled connection (default: 30)
+        DB_POOL_RECYCLE    recycle connections older than this many seconds (default: -1, never)
+        DB_POOL_PRE_PING   "1" to test connections on checkout (default: 0)
+        DB_ECHO            "1" to log SQL (default: 0)
+        SQLITE_PROFILE     "default" or "performance" (see PERFORMANCE_PRAGMAS)
+    """
+
+    def __init__(self, url: str = None) -> None:
+        self.url = url or os.getenv("DATABASE_URL") or DB_URL
+        self.pool_size = _env_int("DB_POOL_SIZE", 5)
+        self.max_overflow = _env_int("DB_MAX_OVERFLOW", 10)
+        self.pool_timeout = _env_int("DB_POOL_TIMEOUT", 30)
+        self.pool_recycle = _env_int("DB_POOL_RECYCLE", -1)
+        self.pool_pre_ping = bool(_env_int("DB_POOL_PRE_PING", 0))
+        self.echo = bool(_env_int("DB_ECHO", 0))
+        self.sqlite_profile = os.getenv("SQLITE_PROFILE", "default").strip().lower()
+
+    @property
+    def is_sqlite(self) -> bool:
+        return make_url(self.url).get_backend_name() == "sqlite"
+
+    @property
+    def is_memory_sqlite(self) -> bool:
+        database = make_url(self.url).database
+        return self.is_sqlite and database in (None, "", ":memory:")
+
+    def engine_kwargs(self) -> dict:
+        kwargs = {"echo": self.echo, "pool_pre_ping": self.pool_pre_ping}
+        if self.is_sqlite:
+            kwargs["connect_args"] = {"check_same_thread": False}  # Needed for SQLite
+            if self.is_memory_sqlite:
+                return kwargs  # SingletonThreadPool / StaticPool take no sizing
+        kwargs.update(
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_timeout=self.pool_timeout,
+            pool_recycle=self.pool_recycle,
+        )
+        return kwargs
+
+    def sqlite_pragmas(self) -> dict:
+        if not self.is_sqlite or self.sqlite_profile != "performance":
+            return {}
+        pragmas = {
+            name: os.getenv(f"SQLITE_{name.upper()}", value)
+            for name, value in PERFORMANCE_PRAGMAS.items()
+        }
+        if self.is_memory_sqlite:
+            pragmas.pop("journal_mode")
+            pragmas.pop("mmap_size")
+        return pragmas
+
+    def install_pragmas(self, engine: Engine) -> None:
+        """Apply the profile's PRAGMAs on every new DBAPI connection of `engine`."""
+        pragmas = self.sqlite_pragmas()
+        if not pragmas:
+            return
+
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+            finally:
+                cursor.close()
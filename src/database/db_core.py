@@ -1,25 +1,52 @@
+import os
+from typing import List
+
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel import Session, create_engine
+
+from src.core.metrics import instrument_engine
+from src.database import migrations
+from src.database.db_config import DBConfig
+from src.database.read_only import ReadOnlySession, install_read_only_reset
+
+
+def create_schema(engine: Engine) -> List[int]:
+    """Apply pending migrations; returns the schema versions applied (usually none)."""
+    with engine.begin() as conn:
+        return migrations.migrate(conn)
+
+
+def prepare_database(db_url: str = None) -> None:
+    """Create the schema with a throwaway engine.
+
+    Used by the production server before it spawns workers, so N workers
+    don't race each other through CREATE TABLE on first start.
+    """
+    config = DBConfig(db_url)
+    engine = create_engine(config.url, **config.engine_kwargs())
+    config.install_pragmas(engine)
+    try:
+        create_schema(engine)
+    finally:
+        engine.dispose()
 
-DB_URL = "sqlite:///ourDB.db"
 
 class DBCore:
     _instance: bool = False
 
-    def __init__(self, db_url: str = None) -> None:
+    def __init__(self, db_url: str = None, config: DBConfig = None) -> None:
         if DBCore._instance:
             raise ValueError("DBCore is a singleton class. Use the existing instance.")
-        url = db_url or DB_URL
+        self.config = config or DBConfig(db_url)
 
         ## create engine
-        self._engine = create_engine(
-            url,
-            connect_args={"check_same_thread": False}  # Needed for SQLite
-        )
-        from src.models.contact import Contact
-        from src.models.account import Account
-        ## create tables
-        SQLModel.metadata.create_all(self._engine)
+        self._engine = create_engine(self.config.url, **self.config.engine_kwargs())
+        self._pid = os.getpid()
+        self.config.install_pragmas(self._engine)
+        install_read_only_reset(self._engine)
+        instrument_engine(self._engine)
+        create_schema(self._engine)
         ## create session factory
         self._sessionMaker = sessionmaker(
             bind=self._engine,
@@ -27,13 +54,30 @@ class DBCore:
             autoflush=False,
             autocommit=False,
         )
+        self._readSessionMaker = sessionmaker(
+            bind=self._engine,
+            class_=ReadOnlySession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
         DBCore._instance = True
     def __del__(self) -> None:
         self._engine.dispose()
         DBCore._instance = False
 
+    def _ensure_own_pool(self) -> None:
+        # A forked child must never reuse the parent's pooled connections
+        # (SQLite file handles / Postgres sockets); drop them without closing.
+        if self._pid != os.getpid():
+            self._engine.dispose(close=False)
+            self._pid = os.getpid()
+
     def get_session(self):
+        self._ensure_own_pool()
         if self._sessionMaker is not None:
             return self._sessionMaker()
         return None
 
+    def get_read_session(self) -> ReadOnlySession:
+        self._ensure_own_pool()
+        return self._readSessionMaker()
@@ -0,0 +1,140 @@
+"""Versioned schema migrations.
+
+The applied version is stored in `schema_version`, so a start-up against an
+up-to-date database costs one table lookup and one MAX() query instead of
+reflecting every table, index and trigger.
+
+Each migration is applied once, in order, inside the caller's transaction.
+Steps use `checkfirst` / `IF NOT EXISTS`, so a database created before
+versioning (by `create_all`) is adopted without errors.
+To change the schema, append a step to `MIGRATIONS`; never edit an applied one.
+"""
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, Enum, Integer, MetaData, String, Table, func, inspect, select, text,
+)
+from sqlalchemy.engine import Connection
+
+from src.database import contact_search
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+## The tables as of version 1, frozen here rather than taken from the models,
+## so that the later steps create the columns and indexes they introduce.
+_v1 = MetaData()
+
+_account_v1 = Table(
+    "account",
+    _v1,
+    Column("id", Integer, primary_key=True),
+    Column("username", String, nullable=False, unique=True, index=True),
+    Column("email", String, nullable=False, unique=True, index=True),
+    Column("hashed_password", String, nullable=False),
+    Column("role", Enum("user", "admin", name="roleenum"), nullable=False),
+    Column("created_at", Date, nullable=False),
+    Column("is_active", Boolean, nullable=False),
+)
+
+_contact_v1 = Table(
+    "contact",
+    _v1,
+    Column("id", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("email", String, nullable=False, unique=True, index=True),
+    Column("date_of_birth", Date, nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("created_at", Date, nullable=False),
+    Column("owner_id", Integer, nullable=False),
+)
+
+
+def _create_core_tables(conn: Connection) -> None:
+    _account_v1.create(conn, checkfirst=True)
+    _contact_v1.create(conn, checkfirst=True)
+
+
+def _create_contact_indexes(conn: Connection, *names: str) -> None:
+    from src.models.contact import Contact
+    for index in Contact.__table__.indexes:
+        if index.name in names:
+            index.create(conn, checkfirst=True)
+
+
+def _create_contact_owner_indexes(conn: Connection) -> None:
+    _create_contact_indexes(conn, "ix_contact_owner_id_id", "ix_contact_owner_id_date_of_birth")
+
+
+def _create_owner_version(conn: Connection) -> None:
+    from src.models.owner_version import OwnerVersion
+    OwnerVersion.__table__.create(conn, checkfirst=True)
+
+
+def _create_contact_fts(conn: Connection) -> None:
+    contact_search.create_fts(conn)
+
+
+def _create_contact_stats_index(conn: Connection) -> None:
+    _create_contact_indexes(conn, "ix_contact_owner_id_created_at")
+
+
+def _add_contact_change_version(conn: Connection) -> None:
+    from src.models.contact import Contact
+    if "change_version" not in {column["name"] for column in inspect(conn).get_columns("contact")}:
+        conn.execute(text("ALTER TABLE contact ADD COLUMN change_version INTEGER"))
+    ## rows from before the stamp count as part of every earlier export
+    table = Contact.__table__
+    conn.execute(table.update().where(table.c.change_version.is_(None)).values(change_version=0))
+    _create_contact_indexes(conn, "ix_contact_owner_id_change_version")
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "account and contact tables", _create_core_tables),
+    (2, "contact indexes for owner-scoped listings", _create_contact_owner_indexes),
+    (3, "per-owner change counter", _create_owner_version),
+    (4, "contact full-text index", _create_contact_fts),
+    (5, "covering index for per-owner contact statistics", _create_contact_stats_index),
+    (6, "contact insert stamp for incremental exports", _add_contact_change_version),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn: Connection) -> Optional[int]:
+    """Applied schema version, or None for a database that has never been versioned."""
+    if not inspect(conn).has_table(schema_version.name):
+        return None
+    return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def migrate(conn: Connection) -> List[int]:
+    """Bring the schema up to `LATEST_VERSION`; returns the versions applied."""
+    version = current_version(conn)
+    if version == LATEST_VERSION:
+        return []
+    if version is None:
+        schema_version.create(conn)
+        version = 0
+    if version > LATEST_VERSION:
+        raise RuntimeError(
+            f"Database schema version {version} is newer than this code ({LATEST_VERSION})"
+        )
+
+    applied = []
+    for number, description, step in MIGRATIONS:
+        if number <= version:
+            continue
+        step(conn)
+        conn.execute(schema_version.insert().values(
+            version=number, description=description, applied_at=datetime.now(timezone.utc),
+        ))
+        applied.append(number)
+    return applied
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from src.models.owner_version import OwnerVersion
+
+
+def bump_statement(dialect_name: str, owner_id: int):
+    """Single-statement upsert that increments and returns the owner's version (None if the dialect has no upsert)."""
+    now = datetime.now(timezone.utc)
+    if dialect_name == "sqlite":
+        insert = sqlite.insert
+    elif dialect_name == "postgresql":
+        insert = postgresql.insert
+    else:
+        return None
+    stmt = insert(OwnerVersion).values(owner_id=owner_id, version=1, updated_at=now)
+    return stmt.on_conflict_do_update(
+        index_elements=[OwnerVersion.owner_id],
+        set_={"version": OwnerVersion.version + 1, "updated_at": now},
+    ).returning(OwnerVersion.version)
+
+
+def increment_statement(owner_id: int):
+    """Atomic `UPDATE ... SET version = version + 1`: the fallback for dialects without upsert."""
+    return (
+        update(OwnerVersion)
+        .where(OwnerVersion.owner_id == owner_id)
+        .values(version=OwnerVersion.version + 1, updated_at=datetime.now(timezone.utc))
+    )
+
+
+class OwnerVersionRepository:
+    def __init__(self, session: Session):
+        self.session = session
+        self.model = OwnerVersion
+
+    def get(self, owner_id: int) -> Optional[OwnerVersion]:
+        return self.session.get(self.model, owner_id)
+
+    def bump(self, owner_id: int) -> int:
+        """Increment the owner's version; returns the new value."""
+        stmt = bump_statement(self.session.get_bind().dialect.name, owner_id)
+        if stmt is not None:
+            return self.session.exec(stmt).scalar_one()
+
+        result = self.session.exec(increment_statement(owner_id))
+        if result.rowcount == 0:
+            self.session.add(self.model(owner_id=owner_id, version=1))
+            self.session.flush()
+            return 1
+        return self.session.exec(select(self.model.version).where(self.model.owner_id == owner_id)).one()
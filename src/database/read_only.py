@@ -0,0 +1,45 @@
+"""Sessions for requests that only read.
+
+A `ReadOnlySession` asks the database to refuse writes for the whole
+transaction (SQLite `PRAGMA query_only`, PostgreSQL `SET TRANSACTION READ
+ONLY`) and is ended with a rollback instead of a commit. It connects lazily,
+so a request that never queries never checks out a connection.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+_QUERY_ONLY = "query_only"
+
+
+class ReadOnlySession(Session):
+    pass
+
+
+@event.listens_for(ReadOnlySession, "after_begin")
+def _begin_read_only(_session, _transaction, connection) -> None:
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        # in-memory pools hand the same connection to every session of a thread
+        if connection.engine.url.database in (None, "", ":memory:"):
+            return
+        connection.exec_driver_sql("PRAGMA query_only = ON")
+        connection.info[_QUERY_ONLY] = True
+    elif dialect == "postgresql":
+        connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+
+def install_read_only_reset(engine: Engine) -> None:
+    """Clear `query_only` when a connection returns to `engine`'s pool, so writers never inherit it."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "checkin")
+    def _reset_query_only(dbapi_connection, connection_record) -> None:
+        if dbapi_connection is None or not connection_record.info.pop(_QUERY_ONLY, False):
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA query_only = OFF")
+        finally:
+            cursor.close()
@@ -0,0 +1,41 @@
+"""Single-statement inserts that report which unique field got in the way.
+
+`insert_statement` builds `INSERT ... ON CONFLICT DO NOTHING RETURNING id`
+(SQLite >= 3.35, PostgreSQL): the happy path is one round trip, and a
+concurrent duplicate can't slip in between a check and the insert. Only
+when nothing is returned does `conflict_probe` run, to name the field.
+"""
+from typing import Optional, Sequence
+
+from sqlalchemy import or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+UNKNOWN_FIELD = "unknown"
+
+
+def insert_statement(dialect_name: str, model, values: dict):
+    """`INSERT ... ON CONFLICT DO NOTHING RETURNING id`, or None if the dialect has no such form."""
+    if dialect_name == "sqlite":
+        insert = sqlite.insert
+    elif dialect_name == "postgresql":
+        insert = postgresql.insert
+    else:
+        return None
+    return insert(model).values(**values).on_conflict_do_nothing().returning(model.id)
+
+
+def conflict_probe(model, values: dict, fields: Sequence[str]):
+    """One row of booleans, one per field, for a stored row that shares any of `fields`."""
+    matches = [getattr(model, field) == values[field] for field in fields]
+    return (
+        select(*(match.label(field) for match, field in zip(matches, fields)))
+        .where(or_(*matches))
+        .limit(1)
+    )
+
+
+def conflicting_field(row, fields: Sequence[str]) -> Optional[str]:
+    if row is None:
+        return None
+    mapping = row._mapping
+    return next((field for field in fields if mapping[field]), UNKNOWN_FIELD)
@@ -1,18 +1,25 @@
 # src/main.py
 import os
-import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.routing import APIRoute
-from starlette.middleware.base import RequestResponseEndpoint
 from starlette.responses import Response, FileResponse
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 
 from src import app_logging
+from src.api.async_accounts import async_accounts_router
+from src.api.async_contacts import async_contacts_router
 from src.api.contacts import contacts_router
 from src.api.accounts import accounts_router
+from src.core import db_global, metrics
+from src.core.account_cache import account_cache
+from src.core.api_globals import contact_writer, login_limiter, security
+from src.core.hash_pool import HashPoolBusy
+from src.core.rate_limit import RateLimited
+from src.core.stats_cache import stats_cache
+from src.core.timing_middleware import TimingMiddleware
 
 ####################################################################### Logging Configuration
 app_logging.configure_logging()
@@ -22,15 +29,28 @@ logger = app_logging.get_logger("main logger: ")
 async def lifespan(_: FastAPI):
     logger.info("DB initialize - This is how we do it !!")
     base = os.getenv("PUBLIC_BASE_URL", "http://127.0.0.1:8000")
+    db_global.get_db()
+    async_db = db_global.get_async_db()
+    if async_db is not None:
+        await async_db.migrate()
+        logger.info("Async DB mode enabled")
     logger.info(f"App is running at {base} (docs: {base}/docs)")
     try:
         yield
     finally:
+        contact_writer.close()  # commit whatever is still queued before the engines go away
+        if async_db is not None:
+            await async_db.dispose()
+        security.hash_pool.shutdown()
         logger.info("Shutdown complete")
 ####################################################################### FastAPI App Initialization
 app = FastAPI(lifespan=lifespan)
 ####################################################################### Include Routers
+if db_global.DB_MODE == "async":
+    app.include_router(async_accounts_router)
 app.include_router(accounts_router)
+if db_global.DB_MODE == "async":
+    app.include_router(async_contacts_router)
 app.include_router(contacts_router)
 ####################################################################### CORS Middleware Setup
 app.add_middleware(
@@ -44,19 +64,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 ####################################################################### Middleware to Log Request Processing Time
-@app.middleware("http")
-async def log_request_time(
-        request: Request,
-        call_next: RequestResponseEndpoint
-) -> Response:
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    formatted_time = f"{process_time:.4f} sec"
-    logger.info("%s %s took %s", request.method, request.url.path, formatted_time)
-    response.headers["X-Process-Time"] = formatted_time
-    return response
+app.add_middleware(TimingMiddleware)
 
+####################################################################### Exception Handlers
+@app.exception_handler(HashPoolBusy)
+async def hash_pool_busy_handler(_: Request, exc: HashPoolBusy) -> Response:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is busy, please retry shortly"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.exception_handler(RateLimited)
+async def rate_limited_handler(_: Request, exc: RateLimited) -> Response:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many login attempts, please retry later"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+####################################################################### Metrics
+metrics.registry.add_collector("hash_pool", security.hash_pool.stats)
+metrics.registry.add_collector("account_cache", account_cache.stats)
+metrics.registry.add_collector("login_rate_limit", login_limiter.stats)
+metrics.registry.add_collector("contact_writer", contact_writer.stats)
+metrics.registry.add_collector("contact_stats_cache", stats_cache.stats)
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
 ####################################################################### Debugging Endpoints
 
 @app.get("/favicon.ico", include_in_schema=False)
@@ -72,6 +107,14 @@ def debug_routes() -> HTMLResponse:
     html = "<br>".join(lines)
     return HTMLResponse(content=html)
 
+@app.get("/api/debug/hash-pool")
+def debug_hash_pool() -> JSONResponse:
+    return JSONResponse(content=security.hash_pool.stats())
+
+@app.get("/api/debug/account-cache")
+def debug_account_cache() -> JSONResponse:
+    return JSONResponse(content=account_cache.stats())
+
 
 """
 python -m src.run_server
@@ -1,7 +1,18 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 from datetime import date
+from typing import List, Optional
+
+MAX_BATCH_DELETE_IDS = 10_000
 
 class Contact(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_contact_owner_id_id", "owner_id", "id"),
+        Index("ix_contact_owner_id_date_of_birth", "owner_id", "date_of_birth"),
+        Index("ix_contact_owner_id_created_at", "owner_id", "created_at", "is_active"),
+        Index("ix_contact_owner_id_change_version", "owner_id", "change_version"),
+    )
+
     id: int = Field( primary_key=True)
     name: str
     email: str = Field(unique=True, index=True)
@@ -9,3 +20,15 @@ class Contact(SQLModel, table=True):
     is_active: bool = Field(default=True)
     created_at: date = Field(default_factory=date.today)
     owner_id: int
+    ## owner version bumped by the inserting transaction - a server-assigned, commit-ordered
+    ## insert stamp for incremental exports (ids are chosen by the client)
+    change_version: Optional[int] = Field(default=None)
+
+
+class ContactBatchDelete(SQLModel):
+    """Body of the batch delete API; the given criteria are combined with AND."""
+
+    ids: Optional[List[int]] = Field(default=None, max_length=MAX_BATCH_DELETE_IDS)
+    id_from: Optional[int] = Field(default=None, ge=0)
+    id_to: Optional[int] = Field(default=None, ge=0)
+    older_than_days: Optional[int] = Field(default=None, ge=0)
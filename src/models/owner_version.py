@@ -0,0 +1,9 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime, timezone
+
+class OwnerVersion(SQLModel, table=True):
+    """Change counter per contact owner, bumped in the same transaction as every contact write."""
+
+    owner_id: int = Field(primary_key=True)
+    version: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
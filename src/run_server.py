@@ -1,4 +1,59 @@
+import argparse
+import importlib.util
+import os
+
 import uvicorn
 
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Details Share API.")
+    parser.add_argument("--mode", choices=("dev", "production"), default=os.getenv("SERVER_MODE", "dev"))
+    parser.add_argument("--host", default=os.getenv("HOST"))
+    parser.add_argument("--port", type=int, default=_env_int("PORT", 8000))
+    parser.add_argument("--workers", type=int, default=_env_int("WEB_CONCURRENCY", os.cpu_count() or 1))
+    parser.add_argument("--keep-alive", type=int, default=_env_int("KEEP_ALIVE_TIMEOUT", 30))
+    parser.add_argument("--backlog", type=int, default=_env_int("BACKLOG", 2048))
+    parser.add_argument("--graceful-timeout", type=int, default=_env_int("GRACEFUL_SHUTDOWN_TIMEOUT", 30))
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+
+    if args.mode == "dev":
+        os.environ.setdefault("TEMPLATES_AUTO_RELOAD", "1")  # re-render cached pages when templates are edited
+        uvicorn.run("src.main:app", host=args.host or "127.0.0.1", port=args.port, reload=True)
+        return
+
+    ## Production: the app is passed as an import string, so the supervisor never
+    ## imports it - each spawned worker builds its own DBCore engine after start-up.
+    ## The schema is created once here, before the workers exist.
+    os.environ.setdefault("LOGIN_RATE_LIMIT", "sqlite")  # one login budget across all workers
+    from src.database.db_core import prepare_database
+    prepare_database()
+
+    uvicorn.run(
+        "src.main:app",
+        host=args.host or "0.0.0.0",
+        port=args.port,
+        workers=max(1, args.workers),
+        loop="uvloop" if _available("uvloop") else "asyncio",
+        http="httptools" if _available("httptools") else "h11",
+        timeout_keep_alive=args.keep_alive,
+        backlog=args.backlog,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
+        access_log=False,  # TimingMiddleware already logs (sampled) requests
+    )
+
+
 if __name__ == "__main__":
-    uvicorn.run("src.main:app", host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
+    main()
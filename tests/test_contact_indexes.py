@@ -0,0 +1,74 @@
+"""The owner-scoped listing queries must be served by the contact owner indexes.
+
+Each test runs a repository method against a migrated SQLite file, captures
+the SQL it emitted, and checks `EXPLAIN QUERY PLAN` for the expected index.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, create_engine
+
+from src.database import db_core
+from src.database.contact_repository import ContactRepository, age_above_condition, age_between_condition
+from src.models.contact import Contact
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'contacts.db'}")
+    db_core.create_schema(engine)
+    with Session(engine) as session:
+        ContactRepository(session).bulk_insert([
+            Contact(
+                id=i, name=f"n{i}", email=f"e{i}@x", date_of_birth=date(1950 + i % 60, 1, 1), owner_id=1 + i % 2,
+            ).model_dump()
+            for i in range(1, 201)
+        ])
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+def query_plans(engine, run) -> list:
+    """Run `run(repo)` and return the query plan of every contact SELECT it issued."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM contact" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with Session(engine) as session:
+            result = run(ContactRepository(session))
+            if result is not None:
+                list(result)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert statements, "no contact SELECT was issued"
+    with engine.connect() as conn:
+        return [
+            " | ".join(row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+            for statement, parameters in statements
+        ]
+
+
+@pytest.mark.parametrize("run", [
+    lambda repo: repo.stream_rows(1, age_between_condition(20, 40)),
+    lambda repo: repo.stream_rows(1, age_above_condition(50)),
+], ids=["between_age", "above_age"])
+def test_owner_age_range_uses_owner_date_of_birth_index(engine, run):
+    for plan in query_plans(engine, run):
+        assert "INDEX ix_contact_owner_id_date_of_birth (owner_id=?" in plan, plan
+
+
+@pytest.mark.parametrize("run", [
+    lambda repo: repo.get_rows(owner_id=1, after_id=50, limit=20),
+    lambda repo: repo.stream_rows(1, after_id=50, limit=20),
+], ids=["get_rows", "stream_rows"])
+def test_owner_keyset_page_uses_owner_id_index(engine, run):
+    for plan in query_plans(engine, run):
+        assert "INDEX ix_contact_owner_id_id (owner_id=? AND id>?)" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan